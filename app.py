@@ -1,10 +1,16 @@
-"""Main Flask application with REST API endpoints for the chatbot."""
+"""Main Quart application with REST API endpoints for the chatbot."""
 import logging
 import asyncio
+import os
+import time
 from typing import Dict, Any
-from flask import Flask, request, jsonify, render_template_string
+import httpx
+import orjson
+from openai import APIConnectionError, APITimeoutError
+from quart import Quart, Response, request, jsonify
+from quart.json.provider import DefaultJSONProvider
 from botbuilder.core import (
-    BotFrameworkAdapter, 
+    BotFrameworkAdapter,
     BotFrameworkAdapterSettings,
     TurnContext
 )
@@ -13,7 +19,15 @@ from botbuilder.schema import Activity
 from src.bot.teams_bot import TeamsBot
 from src.services.openai_service import openai_service
 from src.config import config
-import json
+
+# Use uvloop's libuv-based event loop when available - it cuts per-callback
+# dispatch overhead for this I/O-bound proxy workload. Must run before any
+# event loop is created. Uvicorn picks it up via --loop uvloop as well.
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    uvloop = None
 
 # Configure logging
 logging.basicConfig(
@@ -22,15 +36,40 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Create Flask app
-app = Flask(__name__)
+# Snapshot hot config values once at import - every config.* access runs a
+# property descriptor (and can hit Key Vault), which is wasted work on paths
+# like /health that orchestrators probe continuously
+APP_ID = config.microsoft_app_id
+APP_PASSWORD = config.microsoft_app_password
+AOAI_ENDPOINT = config.azure_openai_endpoint
+AOAI_API_KEY = config.azure_openai_api_key
+KEY_VAULT_URL = config.azure_key_vault_url
+IS_MANAGED_IDENTITY_MODE = config.is_managed_identity_mode
+IS_APP_ID_PASSWORD_MODE = config.is_app_id_password_mode
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson - several times faster than stdlib json
+    on both serialize and parse for the multi-KB chat/summary payloads."""
+
+    def dumps(self, object_: Any, **kwargs: Any) -> str:
+        return orjson.dumps(object_).decode("utf-8")
+
+    def loads(self, object_: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(object_)
+
+
+# Create Quart app (async handlers share one persistent event loop,
+# instead of building and tearing down a loop per request)
+app = Quart(__name__)
+app.json = OrjsonProvider(app)
 
 # Bot Framework adapter settings - use App ID/Password if configured, otherwise development mode
-if config.microsoft_app_id and config.microsoft_app_password:
+if APP_ID and APP_PASSWORD:
     logger.info("Using Bot Framework App ID/Password authentication")
     settings = BotFrameworkAdapterSettings(
-        app_id=config.microsoft_app_id,
-        app_password=config.microsoft_app_password
+        app_id=APP_ID,
+        app_password=APP_PASSWORD
     )
 else:
     logger.info("Using Bot Framework development mode (no authentication)")
@@ -40,16 +79,16 @@ else:
     )
 
 # Log authentication configuration status
-logger.info(f"Bot Framework configuration - App ID: {'✓' if config.microsoft_app_id else '✗'}, "
-           f"Password: {'✓' if config.microsoft_app_password else '✗'}, "
-           f"Mode: {'Managed Identity' if config.is_managed_identity_mode else 'App ID/Password' if config.is_app_id_password_mode else 'Development'}")
+logger.info(f"Bot Framework configuration - App ID: {'✓' if APP_ID else '✗'}, "
+           f"Password: {'✓' if APP_PASSWORD else '✗'}, "
+           f"Mode: {'Managed Identity' if IS_MANAGED_IDENTITY_MODE else 'App ID/Password' if IS_APP_ID_PASSWORD_MODE else 'Development'}")
 
 # Validate Bot Framework configuration
-if config.is_managed_identity_mode:
+if IS_MANAGED_IDENTITY_MODE:
     logger.info("✅ Managed Identity mode detected - no password required")
-elif config.is_app_id_password_mode:
+elif IS_APP_ID_PASSWORD_MODE:
     logger.info("✅ App ID/Password mode detected")
-elif not config.microsoft_app_id and not config.microsoft_app_password:
+elif not APP_ID and not APP_PASSWORD:
     logger.warning("⚠️ No Bot Framework credentials configured. Using development mode.")
 else:
     logger.warning("⚠️ Incomplete Bot Framework configuration detected")
@@ -77,7 +116,7 @@ async def on_error(context: TurnContext, error: Exception):
         error_response = ("I'm experiencing authentication issues. Please check the bot configuration "
                          "or contact an administrator.")
     else:
-        logger.error(f"Bot Framework error: {error}")
+        logger.error("Bot Framework error: %s", error)
         error_response = "Sorry, an error occurred. Please try again."
     
     # Send a message to the user if context is available
@@ -85,128 +124,24 @@ async def on_error(context: TurnContext, error: Exception):
         if context and hasattr(context, 'send_activity'):
             await context.send_activity(error_response)
     except KeyError as send_error:
-        logger.warning(f"Cannot send error message due to missing access token: {send_error}")
+        logger.warning("Cannot send error message due to missing access token: %s", send_error)
     except Exception as send_error:
-        logger.error(f"Failed to send error message to user: {send_error}")
+        logger.error("Failed to send error message to user: %s", send_error)
 
 
 adapter.on_turn_error = on_error
 
 
-@app.route("/")
-def home():
-    """Simple web interface for testing the chatbot."""
-    html = """
+# The home page is fully static - encode it once at import time instead of
+# pushing ~6 KB through the Jinja pipeline (and a str->bytes copy) per GET.
+_HOME_HTML = """
     <!DOCTYPE html>
     <html>
     <head>
         <title>Azure Teams AI Chatbot</title>
         <meta charset="utf-8">
         <meta name="viewport" content="width=device-width, initial-scale=1">
-        <style>
-            body {
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                max-width: 800px;
-                margin: 0 auto;
-                padding: 20px;
-                background-color: #f5f5f5;
-            }
-            .container {
-                background: white;
-                border-radius: 8px;
-                padding: 30px;
-                box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-            }
-            h1 {
-                color: #2c3e50;
-                text-align: center;
-                margin-bottom: 30px;
-            }
-            .chat-container {
-                border: 1px solid #ddd;
-                border-radius: 8px;
-                height: 400px;
-                overflow-y: auto;
-                padding: 15px;
-                margin-bottom: 20px;
-                background-color: #fafafa;
-            }
-            .message {
-                margin-bottom: 15px;
-                padding: 10px;
-                border-radius: 8px;
-                max-width: 80%;
-            }
-            .user-message {
-                background-color: #007acc;
-                color: white;
-                margin-left: auto;
-                text-align: right;
-            }
-            .bot-message {
-                background-color: #e9ecef;
-                color: #333;
-            }
-            .input-container {
-                display: flex;
-                gap: 10px;
-            }
-            #messageInput {
-                flex: 1;
-                padding: 12px;
-                border: 1px solid #ddd;
-                border-radius: 4px;
-                font-size: 16px;
-            }
-            #sendButton {
-                padding: 12px 24px;
-                background-color: #007acc;
-                color: white;
-                border: none;
-                border-radius: 4px;
-                cursor: pointer;
-                font-size: 16px;
-            }
-            #sendButton:hover {
-                background-color: #005a9e;
-            }
-            #sendButton:disabled {
-                background-color: #ccc;
-                cursor: not-allowed;
-            }
-            .status {
-                text-align: center;
-                padding: 10px;
-                margin: 10px 0;
-                border-radius: 4px;
-            }
-            .loading {
-                background-color: #fff3cd;
-                color: #856404;
-                border: 1px solid #ffeaa7;
-            }
-            .error {
-                background-color: #f8d7da;
-                color: #721c24;
-                border: 1px solid #f5c6cb;
-            }
-            .feature-list {
-                margin: 20px 0;
-            }
-            .feature-list ul {
-                list-style-type: none;
-                padding: 0;
-            }
-            .feature-list li {
-                padding: 8px 0;
-                border-bottom: 1px solid #eee;
-            }
-            .feature-list li:before {
-                content: "✓ ";
-                color: #28a745;
-                font-weight: bold;
-            }
-        </style>
+        <link rel="stylesheet" href="/static/home.css">
     </head>
     <body>
         <div class="container">
@@ -243,124 +178,58 @@ def home():
             </div>
         </div>
 
-        <script>
-            let conversationId = 'web-' + Math.random().toString(36).substr(2, 9);
-            
-            function addMessage(content, isUser = false) {
-                const chatContainer = document.getElementById('chatContainer');
-                const messageDiv = document.createElement('div');
-                messageDiv.className = 'message ' + (isUser ? 'user-message' : 'bot-message');
-                messageDiv.textContent = content;
-                chatContainer.appendChild(messageDiv);
-                chatContainer.scrollTop = chatContainer.scrollHeight;
-            }
-            
-            function showStatus(message, type = '') {
-                const statusDiv = document.getElementById('status');
-                statusDiv.textContent = message;
-                statusDiv.className = 'status ' + type;
-                if (type === '') {
-                    setTimeout(() => {
-                        statusDiv.textContent = '';
-                        statusDiv.className = 'status';
-                    }, 3000);
-                }
-            }
-            
-            async function sendMessage() {
-                const input = document.getElementById('messageInput');
-                const sendButton = document.getElementById('sendButton');
-                const message = input.value.trim();
-                
-                if (!message) return;
-                
-                // Add user message to chat
-                addMessage(message, true);
-                
-                // Clear input and disable send button
-                input.value = '';
-                sendButton.disabled = true;
-                showStatus('Thinking...', 'loading');
-                
-                try {
-                    const response = await fetch('/api/chat', {
-                        method: 'POST',
-                        headers: {
-                            'Content-Type': 'application/json',
-                        },
-                        body: JSON.stringify({
-                            message: message,
-                            conversation_id: conversationId,
-                            user_name: 'Web User'
-                        })
-                    });
-                    
-                    const data = await response.json();
-                    
-                    if (response.ok) {
-                        addMessage(data.response);
-                        showStatus('');
-                    } else {
-                        addMessage('Error: ' + (data.error || 'Unknown error occurred'));
-                        showStatus('Error sending message', 'error');
-                    }
-                } catch (error) {
-                    addMessage('Error: Failed to connect to the chatbot service');
-                    showStatus('Connection error', 'error');
-                }
-                
-                sendButton.disabled = false;
-                input.focus();
-            }
-            
-            // Focus on input when page loads
-            document.getElementById('messageInput').focus();
-        </script>
+        <script src="/static/home.js"></script>
     </body>
     </html>
-    """
-    return render_template_string(html)
+    """.encode("utf-8")
+
+
+@app.route("/")
+async def home():
+    """Simple web interface for testing the chatbot."""
+    return Response(
+        _HOME_HTML,
+        mimetype="text/html",
+        headers={"Cache-Control": "public, max-age=3600"}
+    )
 
 
 @app.route("/api/messages", methods=["POST"])
-def messages():
+async def messages():
     """
     Bot Framework messaging endpoint for Teams integration.
-    
+
     Returns:
         JSON response with status
     """
     try:
-        # Get the activity from the request
-        activity = Activity().deserialize(request.json)
+        # Parse the raw body once with orjson; cache=False avoids keeping a
+        # second copy of the payload bytes alive on the request object
+        payload = orjson.loads(await request.get_data(cache=False))
+        activity = Activity().deserialize(payload)
         auth_header = request.headers.get("Authorization", "")
-        
-        # Process the activity
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        task = loop.create_task(
-            adapter.process_activity(activity, auth_header, bot.on_turn)
-        )
-        loop.run_until_complete(task)
-        loop.close()
-        
+
+        # Process the activity on the running event loop
+        await adapter.process_activity(activity, auth_header, bot.on_turn)
+
         return jsonify({"status": "ok"})
-        
+
+    except orjson.JSONDecodeError:
+        return jsonify({"error": "Invalid JSON payload"}), 400
     except KeyError as e:
         if str(e) == "'access_token'":
-            logger.error(f"Bot Framework authentication error: {e}. This indicates a configuration issue.")
+            logger.error("Bot Framework authentication error: %s. This indicates a configuration issue.", e)
             return jsonify({"error": "Authentication configuration error"}), 500
         else:
-            logger.error(f"Bot Framework KeyError: {e}")
+            logger.error("Bot Framework KeyError: %s", e)
             return jsonify({"error": str(e)}), 500
     except Exception as e:
-        logger.error(f"Error processing Bot Framework message: {e}")
+        logger.exception("Error processing Bot Framework message")
         return jsonify({"error": str(e)}), 500
 
 
 @app.route("/api/chat", methods=["POST"])
-def chat():
+async def chat():
     """
     Direct chat API endpoint for web interface and external integrations.
     
@@ -375,40 +244,81 @@ def chat():
         JSON response with AI response
     """
     try:
-        data = request.get_json()
-        
+        data = await request.get_json(silent=True)
+
         if not data or "message" not in data:
             return jsonify({"error": "Message is required"}), 400
-        
+
         message = data["message"]
         conversation_id = data.get("conversation_id", f"api-{request.remote_addr}")
         user_name = data.get("user_name", "API User")
-        
+
         # Get response from OpenAI service
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        response = loop.run_until_complete(
-            openai_service.get_chat_response(
-                message=message,
-                conversation_id=conversation_id,
-                user_name=user_name
-            )
+        response = await openai_service.get_chat_response(
+            message=message,
+            conversation_id=conversation_id,
+            user_name=user_name
         )
-        loop.close()
-        
+
         return jsonify({
             "response": response,
             "conversation_id": conversation_id
         })
         
-    except Exception as e:
-        logger.error(f"Error processing chat request: {e}")
+    except (asyncio.TimeoutError, APITimeoutError):
+        logger.exception("Timeout processing chat request")
+        return jsonify({"error": "Upstream request timed out"}), 408
+    except (httpx.HTTPError, APIConnectionError):
+        logger.exception("Upstream HTTP error processing chat request")
+        return jsonify({"error": "Upstream service error"}), 502
+    except Exception:
+        logger.exception("Error processing chat request")
         return jsonify({"error": "Internal server error"}), 500
 
 
+@app.route("/api/chat/stream", methods=["POST"])
+async def chat_stream():
+    """
+    Streaming chat API endpoint using Server-Sent Events.
+
+    Accepts the same JSON payload as /api/chat and streams the AI response
+    back as `data:` events while the model generates, cutting time-to-first-
+    token from full generation time to first-chunk latency.
+
+    Returns:
+        SSE response streaming JSON-encoded text deltas, ending with [DONE]
+    """
+    data = await request.get_json(silent=True)
+
+    if not data or "message" not in data:
+        return jsonify({"error": "Message is required"}), 400
+
+    message = data["message"]
+    conversation_id = data.get("conversation_id", f"api-{request.remote_addr}")
+    user_name = data.get("user_name", "API User")
+
+    async def generate():
+        try:
+            async for chunk in openai_service.get_chat_response_stream(
+                message=message,
+                conversation_id=conversation_id,
+                user_name=user_name
+            ):
+                yield b"data: " + orjson.dumps({"delta": chunk}) + b"\n\n"
+        except Exception as e:
+            logger.error("Error streaming chat response: %s", e)
+            yield b"data: " + orjson.dumps({"error": "Internal server error"}) + b"\n\n"
+        yield b"data: [DONE]\n\n"
+
+    return Response(
+        generate(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @app.route("/api/conversation/<conversation_id>/clear", methods=["POST"])
-def clear_conversation(conversation_id: str):
+async def clear_conversation(conversation_id: str):
     """
     Clear conversation history for a specific conversation.
     
@@ -422,13 +332,13 @@ def clear_conversation(conversation_id: str):
         openai_service.clear_conversation(conversation_id)
         return jsonify({"status": "cleared", "conversation_id": conversation_id})
         
-    except Exception as e:
-        logger.error(f"Error clearing conversation: {e}")
+    except Exception:
+        logger.exception("Error clearing conversation")
         return jsonify({"error": "Internal server error"}), 500
 
 
 @app.route("/api/conversation/<conversation_id>/summary", methods=["GET"])
-def conversation_summary(conversation_id: str):
+async def conversation_summary(conversation_id: str):
     """
     Get conversation summary and statistics.
     
@@ -442,46 +352,94 @@ def conversation_summary(conversation_id: str):
         summary = openai_service.get_conversation_summary(conversation_id)
         return jsonify(summary)
         
-    except Exception as e:
-        logger.error(f"Error getting conversation summary: {e}")
+    except Exception:
+        logger.exception("Error getting conversation summary")
         return jsonify({"error": "Internal server error"}), 500
 
 
+# Async-aware profiling: cProfile can't attribute await time, so expose an
+# opt-in pyinstrument pass over the live loop. Gated off in production unless
+# PROFILE=1 is set explicitly.
+_PROFILING_ENABLED = os.getenv("PROFILE") == "1" or config.flask_env == "development"
+
+
+@app.route("/debug/profile", methods=["GET"])
+async def debug_profile():
+    """
+    Profile the running event loop for a few seconds with pyinstrument.
+
+    Usage: GET /debug/profile?seconds=10 - returns an HTML report showing
+    await-time attribution across the chat and Teams send paths.
+    """
+    if not _PROFILING_ENABLED:
+        return jsonify({"error": "Not found"}), 404
+
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        return jsonify({"error": "pyinstrument is not installed"}), 501
+
+    seconds = min(float(request.args.get("seconds", 10)), 60.0)
+    profiler = Profiler(async_mode="enabled")
+    profiler.start()
+    await asyncio.sleep(seconds)
+    profiler.stop()
+
+    return Response(profiler.output_html(), mimetype="text/html")
+
+
+# Orchestrator probes can hit health endpoints every second per replica -
+# cache the detailed report in short time buckets and keep a free-standing
+# liveness probe that does no work at all.
+_HEALTH_CACHE_SECONDS = 5
+_health_cache: Dict[str, Any] = {"bucket": None, "payload": None, "status_code": None}
+
+
+@app.route("/healthz/live", methods=["GET"])
+async def liveness_check():
+    """Cheap liveness probe - empty 200 while the process is up."""
+    return "", 200
+
+
 @app.route("/health", methods=["GET"])
-def health_check():
+async def health_check():
     """
-    Health check endpoint for monitoring.
-    
+    Health check endpoint for monitoring (readiness/detailed variant).
+
     Returns:
         JSON response with health status
     """
     try:
+        bucket = int(time.monotonic() // _HEALTH_CACHE_SECONDS)
+        if not app.testing and _health_cache["bucket"] == bucket:
+            return jsonify(_health_cache["payload"]), _health_cache["status_code"]
+
         health_status = {
             "status": "healthy",
             "service": "Azure Teams AI Chatbot",
             "version": "1.0.0",
             "components": {
-                "flask": "ok",
+                "web": "ok",
                 "bot_framework": "ok",
-                "azure_openai": "ok" if config.azure_openai_endpoint else "not_configured",
-                "configuration": "ok" if config.microsoft_app_id else "incomplete"
+                "azure_openai": "ok" if AOAI_ENDPOINT else "not_configured",
+                "configuration": "ok" if APP_ID else "incomplete"
             }
         }
         
         # Check if critical configuration is missing
-        if not config.azure_openai_endpoint:
+        if not AOAI_ENDPOINT:
             health_status["status"] = "degraded"
             health_status["components"]["azure_openai"] = "endpoint_not_configured"
-        elif not config.azure_openai_api_key:
+        elif not AOAI_API_KEY:
             health_status["status"] = "degraded"
             health_status["components"]["azure_openai"] = "api_key_not_configured"
         
         # For Bot Framework, provide detailed authentication status
-        if config.is_managed_identity_mode:
+        if IS_MANAGED_IDENTITY_MODE:
             health_status["components"]["bot_framework"] = "managed_identity_mode"
-        elif config.is_app_id_password_mode:
+        elif IS_APP_ID_PASSWORD_MODE:
             health_status["components"]["bot_framework"] = "app_id_password_mode"
-        elif not config.microsoft_app_id:
+        elif not APP_ID:
             health_status["status"] = "degraded"
             health_status["components"]["bot_framework"] = "app_id_not_configured"
         else:
@@ -491,32 +449,40 @@ def health_check():
         # Add Key Vault status
         if hasattr(config, '_key_vault_client') and config._key_vault_client:
             health_status["components"]["key_vault"] = "ok"
-        elif config.azure_key_vault_url:
+        elif KEY_VAULT_URL:
             health_status["components"]["key_vault"] = "configured_but_failed"
         else:
             health_status["components"]["key_vault"] = "not_configured"
         
         status_code = 200 if health_status["status"] == "healthy" else 503
+        _health_cache.update(bucket=bucket, payload=health_status, status_code=status_code)
         return jsonify(health_status), status_code
         
     except Exception as e:
-        logger.error(f"Health check error: {e}")
+        logger.exception("Health check error")
         return jsonify({
             "status": "unhealthy",
             "error": str(e)
         }), 500
 
 
+@app.after_request
+async def add_keepalive_headers(response):
+    """Advertise keep-alive so browsers reuse the connection across turns."""
+    response.headers.setdefault("Keep-Alive", "timeout=75")
+    return response
+
+
 @app.errorhandler(404)
-def not_found(error):
+async def not_found(error):
     """Handle 404 errors."""
     return jsonify({"error": "Not found"}), 404
 
 
 @app.errorhandler(500)
-def internal_error(error):
+async def internal_error(error):
     """Handle 500 errors."""
-    logger.error(f"Internal server error: {error}")
+    logger.error("Internal server error: %s", error)
     return jsonify({"error": "Internal server error"}), 500
 
 
@@ -524,16 +490,34 @@ if __name__ == "__main__":
     # Configure Application Insights if available
     if config.appinsights_connection_string:
         try:
-            from applicationinsights.flask.ext import AppInsights
-            appinsights = AppInsights(app)
+            from applicationinsights import TelemetryClient
+            telemetry_client = TelemetryClient(config.appinsights_instrumentation_key)
             logger.info("Application Insights initialized")
         except ImportError:
             logger.warning("Application Insights library not available")
-    
-    # Start the Flask application
+
+    # Optional whole-process profile: PROFILE=1 dumps profile.html on exit
+    profiler = None
+    if os.getenv("PROFILE") == "1":
+        try:
+            from pyinstrument import Profiler
+            profiler = Profiler(async_mode="enabled")
+            profiler.start()
+            logger.info("pyinstrument profiling enabled; report written to profile.html on exit")
+        except ImportError:
+            logger.warning("PROFILE=1 set but pyinstrument is not installed")
+
+    # Start the Quart application (use uvicorn in production, e.g.
+    # `uvicorn app:app --workers N`)
     logger.info(f"Starting Azure Teams AI Chatbot on port {config.port}")
-    app.run(
-        host="0.0.0.0",
-        port=config.port,
-        debug=(config.flask_env == "development")
-    )
\ No newline at end of file
+    try:
+        app.run(
+            host="0.0.0.0",
+            port=config.port,
+            debug=(config.flask_env == "development")
+        )
+    finally:
+        if profiler is not None:
+            profiler.stop()
+            with open("profile.html", "w") as f:
+                f.write(profiler.output_html())
\ No newline at end of file
@@ -161,7 +161,9 @@ print_status "Using temporary directory: $DEPLOY_DIR"
 
 # Copy application files
 cp -r src/ "$DEPLOY_DIR/"
+cp -r static/ "$DEPLOY_DIR/"
 cp app.py "$DEPLOY_DIR/"
+cp gunicorn.conf.py "$DEPLOY_DIR/"
 cp requirements.txt "$DEPLOY_DIR/"
 cp "$DEPLOY_ENV_FILE" "$DEPLOY_DIR/.env"
 cp README.md "$DEPLOY_DIR/" 2>/dev/null || true
@@ -182,9 +184,9 @@ if [ -f requirements.txt ]; then
     pip install -r requirements.txt
 fi
 
-# Start the application with Gunicorn
+# Start the application with Gunicorn + Uvicorn workers
 echo "Starting application on port $PORT..."
-gunicorn --bind 0.0.0.0:$PORT --workers 1 --timeout 120 --preload app:app
+gunicorn -c gunicorn.conf.py app:app
 EOF
 
 chmod +x "$DEPLOY_DIR/startup.sh"
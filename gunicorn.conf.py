@@ -0,0 +1,14 @@
+"""Gunicorn configuration for running the Quart app on Uvicorn workers."""
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+
+# Uvicorn workers run the ASGI app on a persistent event loop per process,
+# so each worker handles many concurrent awaits instead of one request at
+# a time under the WSGI model.
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = 2 * multiprocessing.cpu_count() + 1
+worker_connections = 1000
+keepalive = 75
+timeout = 120
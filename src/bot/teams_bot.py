@@ -1,5 +1,7 @@
 """Microsoft Teams Bot Framework integration."""
+import asyncio
 import logging
+from collections import OrderedDict
 from typing import List
 from botbuilder.core import (
     ActivityHandler, 
@@ -20,16 +22,122 @@ from src.config import config
 
 logger = logging.getLogger(__name__)
 
+# Adaptive cards are static apart from the welcome greeting - build the dict
+# literals once at import time instead of on every command/member event.
+_WELCOME_CARD_TEMPLATE = {
+    "type": "AdaptiveCard",
+    "version": "1.0",
+    "body": [
+        {
+            "type": "TextBlock",
+            "text": "",  # filled per member in _send_welcome_message
+            "size": "Medium",
+            "weight": "Bolder"
+        },
+        {
+            "type": "TextBlock",
+            "text": (
+                "I can help you with various tasks, answer questions, and have conversations. "
+                "Just type your message and I'll respond!"
+            ),
+            "wrap": True
+        },
+        {
+            "type": "TextBlock",
+            "text": "**Available Commands:**",
+            "weight": "Bolder",
+            "spacing": "Medium"
+        },
+        {
+            "type": "TextBlock",
+            "text": "• `/help` - Show this help message\n• `/clear` - Clear conversation history\n• `/summary` - Show conversation summary",
+            "wrap": True
+        }
+    ]
+}
+
+_HELP_CARD = {
+    "type": "AdaptiveCard",
+    "version": "1.0",
+    "body": [
+        {
+            "type": "TextBlock",
+            "text": "🤖 AI Assistant Help",
+            "size": "Large",
+            "weight": "Bolder"
+        },
+        {
+            "type": "TextBlock",
+            "text": "I'm an AI-powered chatbot that can help you with various tasks:",
+            "wrap": True
+        },
+        {
+            "type": "TextBlock",
+            "text": "**What I can do:**",
+            "weight": "Bolder",
+            "spacing": "Medium"
+        },
+        {
+            "type": "TextBlock",
+            "text": (
+                "• Answer questions on a wide range of topics\n"
+                "• Help with writing and editing\n"
+                "• Provide explanations and tutorials\n"
+                "• Assist with problem-solving\n"
+                "• Have natural conversations"
+            ),
+            "wrap": True
+        },
+        {
+            "type": "TextBlock",
+            "text": "**Available Commands:**",
+            "weight": "Bolder",
+            "spacing": "Medium"
+        },
+        {
+            "type": "TextBlock",
+            "text": (
+                "• `/help` - Show this help message\n"
+                "• `/clear` - Clear conversation history\n"
+                "• `/summary` - Show conversation summary"
+            ),
+            "wrap": True
+        },
+        {
+            "type": "TextBlock",
+            "text": "**Tips:**",
+            "weight": "Bolder",
+            "spacing": "Medium"
+        },
+        {
+            "type": "TextBlock",
+            "text": (
+                "• Be specific with your questions for better responses\n"
+                "• I remember our conversation context\n"
+                "• Feel free to ask follow-up questions"
+            ),
+            "wrap": True
+        }
+    ]
+}
+
 
 class TeamsBot(ActivityHandler):
     """
     Teams bot that handles conversations using Azure OpenAI.
     """
     
+    # Upper bound on remembered member ids for welcome deduplication
+    _WELCOMED_MEMBERS_MAX = 1024
+
     def __init__(self):
         """Initialize the Teams bot."""
         super().__init__()
-        
+        # Teams may dispatch both the generic and the Teams-specific
+        # member-added event for the same join - remember recently welcomed
+        # member ids (bounded LRU) so each member gets a single greeting
+        self._welcomed_members: OrderedDict = OrderedDict()
+
     async def on_message_activity(self, turn_context: TurnContext):
         """
         Handle message activities from users.
@@ -38,59 +146,83 @@ class TeamsBot(ActivityHandler):
             turn_context: The turn context for the current conversation turn
         """
         try:
+            # Walk the activity once instead of re-resolving attribute chains
+            activity = turn_context.activity
+
             # Get user information
-            user = turn_context.activity.from_property
+            user = activity.from_property
             user_name = user.name if user else "Unknown User"
             user_id = user.id if user else "unknown"
-            
+
             # Get conversation ID
-            conversation_id = turn_context.activity.conversation.id
-            
+            conversation_id = activity.conversation.id
+
             # Get the user's message
-            user_message = turn_context.activity.text.strip()
-            
-            logger.info(f"Received message from {user_name} ({user_id}): {user_message}")
-            
-            # Handle special commands
-            if user_message.lower() in ['/help', 'help']:
-                await self._send_help_message(turn_context)
+            user_message = activity.text.strip()
+
+            logger.info("Received message from %s (%s): %s", user_name, user_id, user_message)
+
+            # Handle special commands via O(1) dict dispatch; the length guard
+            # avoids lowercasing long LLM-bound prompts that can't be commands
+            handler = self._COMMANDS.get(user_message.lower()) if len(user_message) < 16 else None
+            if handler:
+                await handler(self, turn_context, conversation_id)
                 return
-            
-            if user_message.lower() in ['/clear', 'clear']:
-                openai_service.clear_conversation(conversation_id)
-                await turn_context.send_activity(
-                    MessageFactory.text("✅ Conversation history cleared!")
+
+            # Show typing indicator concurrently with the OpenAI call - the
+            # indicator is cosmetic, so don't pay its round-trip up front
+            typing_task = asyncio.create_task(self._send_typing_activity(turn_context))
+
+            try:
+                # Get response from Azure OpenAI
+                ai_response = await openai_service.get_chat_response(
+                    message=user_message,
+                    conversation_id=conversation_id,
+                    user_name=user_name
                 )
-                return
-            
-            if user_message.lower() in ['/summary', 'summary']:
-                await self._send_conversation_summary(turn_context, conversation_id)
-                return
-            
-            # Show typing indicator
-            await self._send_typing_activity(turn_context)
-            
-            # Get response from Azure OpenAI
-            ai_response = await openai_service.get_chat_response(
-                message=user_message,
-                conversation_id=conversation_id,
-                user_name=user_name
-            )
-            
+            finally:
+                # Surface any typing-indicator failure (and never orphan the task)
+                await typing_task
+
             # Send the response
             await turn_context.send_activity(MessageFactory.text(ai_response))
             
-            logger.info(f"Sent AI response to {user_name}")
+            logger.info("Sent AI response to %s", user_name)
             
         except Exception as e:
-            logger.error(f"Error handling message activity: {e}")
+            logger.error("Error handling message activity: %s", e)
             await turn_context.send_activity(
                 MessageFactory.text(
                     "I'm sorry, I encountered an error while processing your message. "
                     "Please try again or contact support if the issue persists."
                 )
             )
-    
+
+    async def _cmd_help(self, turn_context: TurnContext, conversation_id: str):
+        """Handle the /help command."""
+        await self._send_help_message(turn_context)
+
+    async def _cmd_clear(self, turn_context: TurnContext, conversation_id: str):
+        """Handle the /clear command."""
+        openai_service.clear_conversation(conversation_id)
+        await turn_context.send_activity(
+            MessageFactory.text("✅ Conversation history cleared!")
+        )
+
+    async def _cmd_summary(self, turn_context: TurnContext, conversation_id: str):
+        """Handle the /summary command."""
+        await self._send_conversation_summary(turn_context, conversation_id)
+
+    # Command dispatch table built once at class creation
+    _COMMANDS = {
+        "/help": _cmd_help,
+        "help": _cmd_help,
+        "/clear": _cmd_clear,
+        "clear": _cmd_clear,
+        "/summary": _cmd_summary,
+        "summary": _cmd_summary,
+    }
+
     async def on_teams_members_added_activity(
         self, 
         members_added: List[ChannelAccount], 
@@ -98,16 +230,13 @@ class TeamsBot(ActivityHandler):
     ):
         """
         Handle when members are added to the Teams conversation.
-        
+
         Args:
             members_added: List of members that were added
             turn_context: The turn context for the current conversation turn
         """
-        for member in members_added:
-            if member.id != turn_context.activity.recipient.id:
-                # Send welcome message to new members
-                await self._send_welcome_message(turn_context, member.name)
-    
+        await self._handle_members_added(members_added, turn_context)
+
     async def on_members_added_activity(
         self, 
         members_added: List[ChannelAccount], 
@@ -115,16 +244,42 @@ class TeamsBot(ActivityHandler):
     ):
         """
         Handle when members are added to the conversation.
-        
+
         Args:
             members_added: List of members that were added
             turn_context: The turn context for the current conversation turn
         """
+        await self._handle_members_added(members_added, turn_context)
+
+    async def _handle_members_added(
+        self,
+        members_added: List[ChannelAccount],
+        turn_context: TurnContext
+    ):
+        """
+        Welcome newly added members, deduplicating double dispatches.
+
+        Args:
+            members_added: List of members that were added
+            turn_context: The turn context for the current conversation turn
+        """
+        recipient_id = turn_context.activity.recipient.id
+
+        pending = []
         for member in members_added:
-            if member.id != turn_context.activity.recipient.id:
-                # Send welcome message to new members
-                await self._send_welcome_message(turn_context, member.name)
-    
+            if member.id == recipient_id or member.id in self._welcomed_members:
+                continue
+
+            self._welcomed_members[member.id] = True
+            if len(self._welcomed_members) > self._WELCOMED_MEMBERS_MAX:
+                self._welcomed_members.popitem(last=False)
+
+            pending.append(self._send_welcome_message(turn_context, member.name))
+
+        # Welcome all new members concurrently rather than one round-trip at a time
+        if pending:
+            await asyncio.gather(*pending)
+
     async def _send_welcome_message(self, turn_context: TurnContext, user_name: str = None):
         """
         Send a welcome message to new users.
@@ -134,48 +289,20 @@ class TeamsBot(ActivityHandler):
             user_name: Name of the user to welcome
         """
         welcome_text = f"👋 Hello{' ' + user_name if user_name else ''}! I'm your AI assistant."
-        
+
+        # Shallow-copy the template and swap only the dynamic greeting block
         welcome_card = {
-            "type": "AdaptiveCard",
-            "version": "1.0",
+            **_WELCOME_CARD_TEMPLATE,
             "body": [
-                {
-                    "type": "TextBlock",
-                    "text": welcome_text,
-                    "size": "Medium",
-                    "weight": "Bolder"
-                },
-                {
-                    "type": "TextBlock",
-                    "text": (
-                        "I can help you with various tasks, answer questions, and have conversations. "
-                        "Just type your message and I'll respond!"
-                    ),
-                    "wrap": True
-                },
-                {
-                    "type": "TextBlock",
-                    "text": "**Available Commands:**",
-                    "weight": "Bolder",
-                    "spacing": "Medium"
-                },
-                {
-                    "type": "TextBlock",
-                    "text": "• `/help` - Show this help message\n• `/clear` - Clear conversation history\n• `/summary` - Show conversation summary",
-                    "wrap": True
-                }
+                {**_WELCOME_CARD_TEMPLATE["body"][0], "text": welcome_text},
+                *_WELCOME_CARD_TEMPLATE["body"][1:]
             ]
         }
-        
+
         # Create adaptive card attachment
         card_attachment = CardFactory.adaptive_card(welcome_card)
-        
-        # Send the welcome message with card
-        await turn_context.send_activity(
-            MessageFactory.attachment(card_attachment)
-        )
-        
-        # Also send quick action buttons
+
+        # Quick action buttons accompanying the card
         suggested_actions = SuggestedActions(
             actions=[
                 CardAction(
@@ -193,8 +320,13 @@ class TeamsBot(ActivityHandler):
         
         message = MessageFactory.text("What would you like to do?")
         message.suggested_actions = suggested_actions
-        
-        await turn_context.send_activity(message)
+
+        # Both sends are independent round-trips to the Teams service -
+        # overlap them so latency is max() of the two instead of the sum
+        await asyncio.gather(
+            turn_context.send_activity(MessageFactory.attachment(card_attachment)),
+            turn_context.send_activity(message)
+        )
     
     async def _send_help_message(self, turn_context: TurnContext):
         """
@@ -203,72 +335,7 @@ class TeamsBot(ActivityHandler):
         Args:
             turn_context: The turn context for the current conversation turn
         """
-        help_card = {
-            "type": "AdaptiveCard",
-            "version": "1.0",
-            "body": [
-                {
-                    "type": "TextBlock",
-                    "text": "🤖 AI Assistant Help",
-                    "size": "Large",
-                    "weight": "Bolder"
-                },
-                {
-                    "type": "TextBlock",
-                    "text": "I'm an AI-powered chatbot that can help you with various tasks:",
-                    "wrap": True
-                },
-                {
-                    "type": "TextBlock",
-                    "text": "**What I can do:**",
-                    "weight": "Bolder",
-                    "spacing": "Medium"
-                },
-                {
-                    "type": "TextBlock",
-                    "text": (
-                        "• Answer questions on a wide range of topics\n"
-                        "• Help with writing and editing\n"
-                        "• Provide explanations and tutorials\n"
-                        "• Assist with problem-solving\n"
-                        "• Have natural conversations"
-                    ),
-                    "wrap": True
-                },
-                {
-                    "type": "TextBlock",
-                    "text": "**Available Commands:**",
-                    "weight": "Bolder",
-                    "spacing": "Medium"
-                },
-                {
-                    "type": "TextBlock",
-                    "text": (
-                        "• `/help` - Show this help message\n"
-                        "• `/clear` - Clear conversation history\n"
-                        "• `/summary` - Show conversation summary"
-                    ),
-                    "wrap": True
-                },
-                {
-                    "type": "TextBlock",
-                    "text": "**Tips:**",
-                    "weight": "Bolder",
-                    "spacing": "Medium"
-                },
-                {
-                    "type": "TextBlock",
-                    "text": (
-                        "• Be specific with your questions for better responses\n"
-                        "• I remember our conversation context\n"
-                        "• Feel free to ask follow-up questions"
-                    ),
-                    "wrap": True
-                }
-            ]
-        }
-        
-        card_attachment = CardFactory.adaptive_card(help_card)
+        card_attachment = CardFactory.adaptive_card(_HELP_CARD)
         await turn_context.send_activity(MessageFactory.attachment(card_attachment))
     
     async def _send_conversation_summary(self, turn_context: TurnContext, conversation_id: str):
@@ -1,25 +1,112 @@
 """Configuration management for the Azure Teams chatbot."""
+import functools
 import os
 import logging
-from typing import Optional
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
 from azure.identity import DefaultAzureCredential
 from azure.keyvault.secrets import SecretClient
-from dotenv import load_dotenv
+from dotenv import dotenv_values
+
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_environment() -> bool:
+    """
+    Merge .env values into the process environment exactly once.
+
+    dotenv_values parses the file in a single pass and setdefault keeps the
+    precedence of real environment variables; the lru_cache guard makes
+    repeated imports/calls a no-op instead of re-reading the file.
+    """
+    for key, value in dotenv_values().items():
+        if value is not None:
+            os.environ.setdefault(key, value)
+    return True
+
 
 # Load environment variables from .env file
-load_dotenv()
+_load_environment()
 
-logger = logging.getLogger(__name__)
+# Values copied straight from .env.example look configured but are not.
+# Compiled once at import so the check is a single automaton pass instead of
+# a chain of per-call substring searches.
+_PLACEHOLDER_RE = re.compile(
+    r"your-|replace-|example-|placeholder|todo|changeme|your_|replace_",
+    re.IGNORECASE
+)
+
+
+def is_placeholder_value(value: Optional[str]) -> bool:
+    """
+    Check whether a config value still looks like an unreplaced placeholder.
+
+    Args:
+        value: The configuration value to inspect
+
+    Returns:
+        True if the value matches a known placeholder pattern
+    """
+    return bool(value and _PLACEHOLDER_RE.search(value))
 
 
 class Config:
     """Application configuration class with Azure Key Vault integration."""
-    
+
+    # Cached secrets expire after this many seconds, so rotated Key Vault
+    # values are picked up without a restart
+    _CACHE_TTL_SECONDS = 300
+
+    # Every secret a property can ask for - prefetched concurrently at
+    # startup so cold start pays ~one Key Vault round-trip instead of one
+    # sequential round-trip per property
+    KNOWN_SECRETS = (
+        'AZURE_OPENAI_ENDPOINT',
+        'AZURE_OPENAI_API_KEY',
+        'AZURE_OPENAI_API_VERSION',
+        'AZURE_OPENAI_DEPLOYMENT_NAME',
+        'MICROSOFT_APP_ID',
+        'MICROSOFT_APP_PASSWORD',
+        'AZURE_KEY_VAULT_URL',
+        'FLASK_ENV',
+        'LOG_LEVEL',
+        'PORT',
+        'DATABASE_URL',
+        'APPINSIGHTS_INSTRUMENTATION_KEY',
+        'APPLICATIONINSIGHTS_CONNECTION_STRING',
+        'MAX_CONVERSATION_HISTORY',
+        'OPENAI_MAX_TOKENS',
+        'OPENAI_TEMPERATURE',
+    )
+
     def __init__(self):
         """Initialize configuration with environment variables and Key Vault."""
         self._key_vault_client = None
+        # Memoize lookups: without this every property access can issue a
+        # Key Vault round-trip, which lands on the chat hot path
+        self._cache: Dict[str, Tuple[float, Optional[str]]] = {}
+        self._parsed_cache: Dict[str, Any] = {}
+        self._cache_lock = threading.Lock()
         self._init_key_vault()
-        
+        self._prefetch_secrets()
+
+    def _prefetch_secrets(self):
+        """Warm the secret cache by fetching all known secrets in parallel."""
+        if not self._key_vault_client:
+            return
+
+        now = time.monotonic()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            values = list(executor.map(self._lookup_secret, self.KNOWN_SECRETS))
+
+        with self._cache_lock:
+            for key, value in zip(self.KNOWN_SECRETS, values):
+                self._cache[key] = (now + self._CACHE_TTL_SECONDS, value)
+
     def _init_key_vault(self):
         """Initialize Azure Key Vault client if URL is provided."""
         key_vault_url = os.getenv('AZURE_KEY_VAULT_URL')
@@ -32,7 +119,7 @@ class Config:
                 )
                 logger.info("Azure Key Vault client initialized successfully")
             except Exception as e:
-                logger.warning(f"Failed to initialize Key Vault client: {e}")
+                logger.warning("Failed to initialize Key Vault client: %s", e)
                 self._key_vault_client = None
         else:
             logger.info("AZURE_KEY_VAULT_URL not provided, using environment variables only")
@@ -40,31 +127,85 @@ class Config:
     def get_secret(self, key: str, default: Optional[str] = None) -> Optional[str]:
         """
         Get a secret value, first trying Key Vault, then environment variables.
-        
+
+        Results are cached for _CACHE_TTL_SECONDS so repeated property access
+        does not re-issue Key Vault round-trips on every request.
+
         Args:
             key: The secret key name
             default: Default value if secret is not found
-            
+
         Returns:
             The secret value or default
         """
+        now = time.monotonic()
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached and now < cached[0]:
+                value = cached[1]
+                return value if value is not None else default
+
+        value = self._lookup_secret(key)
+        with self._cache_lock:
+            self._cache[key] = (now + self._CACHE_TTL_SECONDS, value)
+        return value if value is not None else default
+
+    def _lookup_secret(self, key: str) -> Optional[str]:
+        """
+        Resolve a secret from Key Vault, falling back to the environment.
+
+        Args:
+            key: The secret key name
+
+        Returns:
+            The secret value, or None when it is not set anywhere
+        """
         # Try Key Vault first
         if self._key_vault_client:
             try:
                 # Azure Key Vault secret names use hyphens instead of underscores
                 kv_key = key.replace('_', '-')
                 secret = self._key_vault_client.get_secret(kv_key)
-                logger.debug(f"Successfully retrieved secret '{key}' from Key Vault as '{kv_key}'")
+                logger.debug("Successfully retrieved secret '%s' from Key Vault as '%s'",
+                             key, kv_key)
                 return secret.value
             except Exception as e:
-                logger.debug(f"Failed to get secret '{key}' (as '{kv_key}') from Key Vault: {e}")
-        
+                logger.debug("Failed to get secret '%s' (as '%s') from Key Vault: %s",
+                             key, kv_key, e)
+
         # Fall back to environment variables
-        env_value = os.getenv(key, default)
-        if env_value != default:
-            logger.debug(f"Retrieved '{key}' from environment variables")
+        env_value = os.getenv(key)
+        if env_value is not None:
+            logger.debug("Retrieved '%s' from environment variables", key)
         return env_value
-    
+
+    def _get_parsed(self, key: str, default: str, convert: Callable[[str], Any]) -> Any:
+        """
+        Get a secret converted to int/float, caching the parsed value.
+
+        Args:
+            key: The secret key name
+            default: Default raw value if the secret is not found
+            convert: Conversion callable applied to the raw value
+
+        Returns:
+            The converted value
+        """
+        with self._cache_lock:
+            if key in self._parsed_cache:
+                return self._parsed_cache[key]
+
+        value = convert(self.get_secret(key, default))
+        with self._cache_lock:
+            self._parsed_cache[key] = value
+        return value
+
+    def refresh(self):
+        """Clear cached secrets so the next access re-reads Key Vault/env."""
+        with self._cache_lock:
+            self._cache.clear()
+            self._parsed_cache.clear()
+
     # Azure OpenAI Configuration
     @property
     def azure_openai_endpoint(self) -> str:
@@ -127,7 +268,7 @@ class Config:
     @property
     def port(self) -> int:
         """Application port."""
-        return int(self.get_secret('PORT', '3978'))
+        return self._get_parsed('PORT', '3978', int)
     
     # Database Configuration (Optional)
     @property
@@ -150,17 +291,17 @@ class Config:
     @property
     def max_conversation_history(self) -> int:
         """Maximum number of messages to keep in conversation history."""
-        return int(self.get_secret('MAX_CONVERSATION_HISTORY', '10'))
-    
+        return self._get_parsed('MAX_CONVERSATION_HISTORY', '10', int)
+
     @property
     def openai_max_tokens(self) -> int:
         """Maximum tokens for OpenAI requests."""
-        return int(self.get_secret('OPENAI_MAX_TOKENS', '1000'))
-    
+        return self._get_parsed('OPENAI_MAX_TOKENS', '1000', int)
+
     @property
     def openai_temperature(self) -> float:
         """Temperature setting for OpenAI requests."""
-        return float(self.get_secret('OPENAI_TEMPERATURE', '0.7'))
+        return self._get_parsed('OPENAI_TEMPERATURE', '0.7', float)
 
 
 # Global configuration instance
@@ -1,10 +1,12 @@
 """Data models for the Azure Teams chatbot."""
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Set
 from datetime import datetime
 
 
-@dataclass
+# slots=True drops the per-instance __dict__ (~40% smaller messages at
+# thousands of instances) and speeds attribute access via fixed offsets
+@dataclass(slots=True)
 class Message:
     """Represents a conversation message."""
     role: str  # 'user', 'assistant', or 'system'
@@ -14,7 +16,7 @@ class Message:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class Conversation:
     """Represents a conversation with message history."""
     id: str
@@ -22,29 +24,60 @@ class Conversation:
     created_at: datetime = field(default_factory=datetime.now)
     last_activity: datetime = field(default_factory=datetime.now)
     participants: List[str] = field(default_factory=list)
-    
+    # Set sidecar mirroring participants for O(1) membership checks while the
+    # list keeps first-seen ordering
+    participants_set: Set[str] = field(default_factory=set)
+    # Incremental per-role counters maintained by add_message, so the count
+    # getters never rescan the full message list
+    user_message_count: int = 0
+    assistant_message_count: int = 0
+
+    def __post_init__(self):
+        """Seed the derived counters and participant set from pre-populated
+        init values, so direct construction (e.g. Conversation(id=...,
+        messages=[...])) stays consistent with the add_message path."""
+        self.participants_set.update(self.participants)
+
+        for message in self.messages:
+            if message.role == 'user':
+                self.user_message_count += 1
+            elif message.role == 'assistant':
+                self.assistant_message_count += 1
+
+            user_name = message.user_name
+            if user_name and user_name not in self.participants_set:
+                self.participants_set.add(user_name)
+                self.participants.append(user_name)
+
     def add_message(self, message: Message):
         """Add a message to the conversation."""
         self.messages.append(message)
         self.last_activity = datetime.now()
-        
-        if message.user_name and message.user_name not in self.participants:
-            self.participants.append(message.user_name)
-    
+
+        if message.role == 'user':
+            self.user_message_count += 1
+        elif message.role == 'assistant':
+            self.assistant_message_count += 1
+
+        user_name = message.user_name
+        if user_name and user_name not in self.participants_set:
+            self.participants_set.add(user_name)
+            self.participants.append(user_name)
+
     def get_message_count(self) -> int:
         """Get total message count."""
         return len(self.messages)
-    
+
     def get_user_message_count(self) -> int:
         """Get count of user messages."""
-        return len([msg for msg in self.messages if msg.role == 'user'])
-    
+        return self.user_message_count
+
     def get_assistant_message_count(self) -> int:
         """Get count of assistant messages."""
-        return len([msg for msg in self.messages if msg.role == 'assistant'])
+        return self.assistant_message_count
 
 
-@dataclass
+@dataclass(slots=True)
 class ChatRequest:
     """Represents a chat request from the API."""
     message: str
@@ -55,7 +88,7 @@ class ChatRequest:
     temperature: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ChatResponse:
     """Represents a chat response from the API."""
     response: str
@@ -64,7 +97,7 @@ class ChatResponse:
     timestamp: datetime = field(default_factory=datetime.now)
 
 
-@dataclass
+@dataclass(slots=True)
 class ConversationSummary:
     """Represents a conversation summary."""
     conversation_id: str
@@ -97,7 +130,7 @@ class ConversationSummary:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class BotConfiguration:
     """Represents bot configuration settings."""
     azure_openai_endpoint: str
@@ -110,39 +143,27 @@ class BotConfiguration:
     openai_temperature: float = 0.7
     rate_limit_requests_per_minute: int = 60
     
+    # Declarative validation rules: (predicate flagging the error, message).
+    # Data-driven so adding a rule is one line and is_valid can short-circuit
+    # without building an error list.
+    _RULES = (
+        (lambda c: not c.azure_openai_endpoint, "Azure OpenAI endpoint is required"),
+        (lambda c: not c.azure_openai_api_key, "Azure OpenAI API key is required"),
+        (lambda c: not c.azure_openai_deployment, "Azure OpenAI deployment name is required"),
+        (lambda c: not c.microsoft_app_id, "Microsoft App ID is required"),
+        (lambda c: not c.microsoft_app_password, "Microsoft App Password is required"),
+        (lambda c: c.max_conversation_history < 1, "Max conversation history must be at least 1"),
+        (lambda c: c.openai_max_tokens < 1, "OpenAI max tokens must be at least 1"),
+        (lambda c: not 0 <= c.openai_temperature <= 2,
+         "OpenAI temperature must be between 0 and 2"),
+        (lambda c: c.rate_limit_requests_per_minute < 1,
+         "Rate limit must be at least 1 request per minute"),
+    )
+
     def validate(self) -> List[str]:
         """Validate configuration and return list of errors."""
-        errors = []
-        
-        if not self.azure_openai_endpoint:
-            errors.append("Azure OpenAI endpoint is required")
-        
-        if not self.azure_openai_api_key:
-            errors.append("Azure OpenAI API key is required")
-        
-        if not self.azure_openai_deployment:
-            errors.append("Azure OpenAI deployment name is required")
-        
-        if not self.microsoft_app_id:
-            errors.append("Microsoft App ID is required")
-        
-        if not self.microsoft_app_password:
-            errors.append("Microsoft App Password is required")
-        
-        if self.max_conversation_history < 1:
-            errors.append("Max conversation history must be at least 1")
-        
-        if self.openai_max_tokens < 1:
-            errors.append("OpenAI max tokens must be at least 1")
-        
-        if not 0 <= self.openai_temperature <= 2:
-            errors.append("OpenAI temperature must be between 0 and 2")
-        
-        if self.rate_limit_requests_per_minute < 1:
-            errors.append("Rate limit must be at least 1 request per minute")
-        
-        return errors
-    
+        return [message for predicate, message in self._RULES if predicate(self)]
+
     def is_valid(self) -> bool:
         """Check if configuration is valid."""
-        return len(self.validate()) == 0
\ No newline at end of file
+        return not any(predicate(self) for predicate, _ in self._RULES)
\ No newline at end of file
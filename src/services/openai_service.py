@@ -1,139 +1,279 @@
 """Azure OpenAI service integration with conversation memory and error handling."""
 import asyncio
+import atexit
+import hashlib
+import itertools
+import json
 import logging
+import random
 import time
+from collections import deque
+from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional
-from openai import AzureOpenAI
+import httpx
+from cachetools import LRUCache, TTLCache
+from openai import (
+    AsyncAzureOpenAI,
+    APIConnectionError,
+    APIStatusError,
+    APITimeoutError,
+    RateLimitError
+)
 from src.config import config
+from src.utils import RetryHelper
 
 logger = logging.getLogger(__name__)
 
+# Shared HTTP client so every OpenAI call reuses pooled TCP/TLS connections
+# instead of paying a fresh handshake per request. keepalive_expiry keeps
+# warm connections around between chat turns; http2 multiplexes concurrent
+# completions over one connection.
+_http_client = httpx.AsyncClient(
+    limits=httpx.Limits(
+        max_connections=100,
+        max_keepalive_connections=50,
+        keepalive_expiry=60
+    ),
+    http2=True,
+    timeout=30.0
+)
+
+
+def _close_http_client():
+    """Best-effort close of the shared async client at interpreter exit."""
+    try:
+        asyncio.run(_http_client.aclose())
+    except RuntimeError:
+        pass
+
+
+atexit.register(_close_http_client)
+
+
+@dataclass
+class _Conversation:
+    """
+    Per-conversation storage split into system messages and a bounded ring
+    buffer of user/assistant messages, so trimming never rescans history.
+
+    The *_api fields mirror the raw storage as {"role", "content"} dicts so
+    the OpenAI payload never has to be rebuilt from scratch per request.
+    """
+    system: List[Dict[str, Any]] = field(default_factory=list)
+    recent: deque = field(default_factory=deque)
+    system_api: List[Dict[str, str]] = field(default_factory=list)
+    recent_api: deque = field(default_factory=deque)
+
 
 class ConversationMemory:
     """Manages conversation history and context for chatbot interactions."""
-    
+
+    # Bounds for the conversation store: without them every unique
+    # conversation_id would live in process memory forever
+    _MAX_CONVERSATIONS = 10_000
+    _CONVERSATION_TTL_SECONDS = 3600
+
     def __init__(self, max_history: int = None):
         """
         Initialize conversation memory.
-        
+
         Args:
             max_history: Maximum number of messages to keep in history
         """
         self.max_history = max_history or config.max_conversation_history
-        self._conversations: Dict[str, List[Dict[str, Any]]] = {}
-    
-    def add_message(self, conversation_id: str, role: str, content: str, metadata: Dict[str, Any] = None):
+        self._conversations: TTLCache = TTLCache(
+            maxsize=self._MAX_CONVERSATIONS,
+            ttl=self._CONVERSATION_TTL_SECONDS
+        )
+
+    def __contains__(self, conversation_id: str) -> bool:
+        """Check whether a conversation has any stored state - O(1)."""
+        return conversation_id in self._conversations
+
+    def _get_or_create(self, conversation_id: str) -> _Conversation:
+        """
+        Get the storage for a conversation, creating it if needed.
+
+        Args:
+            conversation_id: Unique identifier for the conversation
+
+        Returns:
+            The conversation storage
+        """
+        conv = self._conversations.get(conversation_id)
+        if conv is None:
+            conv = self._conversations[conversation_id] = _Conversation(
+                recent=deque(maxlen=self.max_history),
+                recent_api=deque(maxlen=self.max_history)
+            )
+        return conv
+
+    def _resize_recent(self, conv: _Conversation):
+        """
+        Rebind the ring buffer so system messages still count against
+        max_history, preserving the original trim semantics.
+
+        Args:
+            conv: The conversation storage to resize
+        """
+        # Floor at 1: even with max_history=1 and a system message set, the
+        # latest user message must survive or the model would be called with
+        # nothing but the system prompt
+        maxlen = max(self.max_history - len(conv.system), 1)
+        if conv.recent.maxlen != maxlen:
+            conv.recent = deque(conv.recent, maxlen=maxlen)
+            conv.recent_api = deque(conv.recent_api, maxlen=maxlen)
+
+    def add_message(
+        self,
+        conversation_id: str,
+        role: str,
+        content: str,
+        metadata: Dict[str, Any] = None
+    ):
         """
         Add a message to conversation history.
-        
+
         Args:
             conversation_id: Unique identifier for the conversation
             role: Message role (user, assistant, system)
             content: Message content
             metadata: Additional message metadata
         """
-        if conversation_id not in self._conversations:
-            self._conversations[conversation_id] = []
-        
+        conv = self._get_or_create(conversation_id)
+
         message = {
             "role": role,
             "content": content,
             "timestamp": time.time()
         }
-        
+
         if metadata:
             message.update(metadata)
-        
-        self._conversations[conversation_id].append(message)
-        
-        # Trim history if it exceeds max_history
-        if len(self._conversations[conversation_id]) > self.max_history:
-            # Keep system messages and trim user/assistant messages
-            system_messages = [msg for msg in self._conversations[conversation_id] if msg["role"] == "system"]
-            other_messages = [msg for msg in self._conversations[conversation_id] if msg["role"] != "system"]
-            
-            # Keep the most recent messages
-            other_messages = other_messages[-(self.max_history - len(system_messages)):]
-            
-            self._conversations[conversation_id] = system_messages + other_messages
-    
+
+        if role == "system":
+            conv.system.append(message)
+            conv.system_api.append({"role": role, "content": content})
+            self._resize_recent(conv)
+        else:
+            # The deques drop the oldest message in O(1) once full - no
+            # filtering or list rebuild on the hot ingest path
+            conv.recent.append(message)
+            conv.recent_api.append({"role": role, "content": content})
+
     def get_conversation(self, conversation_id: str) -> List[Dict[str, Any]]:
         """
         Get conversation history for a given conversation ID.
-        
+
         Args:
             conversation_id: Unique identifier for the conversation
-            
+
         Returns:
             List of messages in the conversation
         """
-        return self._conversations.get(conversation_id, [])
-    
+        conv = self._conversations.get(conversation_id)
+        if conv is None:
+            return []
+        # Touch on read so active conversations stay warm in the TTL cache
+        self._conversations[conversation_id] = conv
+        return conv.system + list(conv.recent)
+
+    def iter_messages(self, conversation_id: str):
+        """
+        Iterate a conversation lazily without materializing the merged list.
+
+        Args:
+            conversation_id: Unique identifier for the conversation
+
+        Returns:
+            Iterator over the conversation's messages (system first)
+        """
+        conv = self._conversations.get(conversation_id)
+        if conv is None:
+            return iter(())
+        return itertools.chain(conv.system, conv.recent)
+
+    def get_api_messages(self, conversation_id: str) -> List[Dict[str, str]]:
+        """
+        Get the API-shaped {"role", "content"} view of a conversation.
+
+        Args:
+            conversation_id: Unique identifier for the conversation
+
+        Returns:
+            List of messages formatted for the OpenAI API
+        """
+        conv = self._conversations.get(conversation_id)
+        if conv is None:
+            return []
+        self._conversations[conversation_id] = conv
+        return conv.system_api + list(conv.recent_api)
+
     def clear_conversation(self, conversation_id: str):
         """
         Clear conversation history for a given conversation ID.
-        
+
         Args:
             conversation_id: Unique identifier for the conversation
         """
         if conversation_id in self._conversations:
             del self._conversations[conversation_id]
-    
+
     def set_system_message(self, conversation_id: str, content: str):
         """
         Set or update the system message for a conversation.
-        
+
         Args:
             conversation_id: Unique identifier for the conversation
             content: System message content
         """
-        if conversation_id not in self._conversations:
-            self._conversations[conversation_id] = []
-        
-        # Remove existing system messages
-        self._conversations[conversation_id] = [
-            msg for msg in self._conversations[conversation_id] 
-            if msg["role"] != "system"
-        ]
-        
-        # Add new system message at the beginning
-        system_message = {
+        conv = self._get_or_create(conversation_id)
+
+        # Replace any existing system messages without touching the ring buffer
+        conv.system = [{
             "role": "system",
             "content": content,
             "timestamp": time.time()
-        }
-        self._conversations[conversation_id].insert(0, system_message)
+        }]
+        conv.system_api = [{"role": "system", "content": content}]
+        self._resize_recent(conv)
 
 
 class RateLimiter:
-    """Simple rate limiter for API calls."""
-    
+    """Token-bucket rate limiter for API calls."""
+
     def __init__(self, max_requests_per_minute: int = 60):
         """
         Initialize rate limiter.
-        
+
         Args:
             max_requests_per_minute: Maximum requests allowed per minute
         """
         self.max_requests = max_requests_per_minute
-        self.requests = []
-    
+        # Token bucket: O(1) state (token count + last refill stamp) instead
+        # of a per-request timestamp window
+        self.capacity = float(max_requests_per_minute)
+        self.refill_rate = max_requests_per_minute / 60.0
+        self.tokens = self.capacity
+        self.last_refill = time.monotonic()
+
+    def _refill(self):
+        """Refill tokens for the time elapsed since the last refill."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate)
+        self.last_refill = now
+
     async def wait_if_needed(self):
-        """Wait if rate limit would be exceeded."""
-        now = time.time()
-        
-        # Remove requests older than 1 minute
-        self.requests = [req_time for req_time in self.requests if now - req_time < 60]
-        
-        if len(self.requests) >= self.max_requests:
-            # Calculate wait time
-            oldest_request = min(self.requests)
-            wait_time = 60 - (now - oldest_request)
-            if wait_time > 0:
-                logger.info(f"Rate limit reached, waiting {wait_time:.2f} seconds")
-                await asyncio.sleep(wait_time)
-        
-        self.requests.append(now)
+        """Wait if rate limit would be exceeded - O(1), constant memory."""
+        self._refill()
+
+        if self.tokens < 1.0:
+            wait_time = (1.0 - self.tokens) / self.refill_rate
+            logger.info("Rate limit reached, waiting %.2f seconds", wait_time)
+            await asyncio.sleep(wait_time)
+            self._refill()
+
+        self.tokens -= 1.0
 
 
 class AzureOpenAIService:
@@ -141,14 +281,25 @@ class AzureOpenAIService:
     
     def __init__(self):
         """Initialize Azure OpenAI service."""
-        self.client = AzureOpenAI(
+        # Async client: the completion call awaits on the event loop instead
+        # of blocking it for the full model latency, so concurrent
+        # conversations are no longer serialized
+        self.client = AsyncAzureOpenAI(
             api_key=config.azure_openai_api_key,
             api_version=config.azure_openai_api_version,
-            azure_endpoint=config.azure_openai_endpoint
+            azure_endpoint=config.azure_openai_endpoint,
+            http_client=_http_client
         )
         self.deployment_name = config.azure_openai_deployment_name
+        # Bind per-request parameters once - config properties run descriptor
+        # and cache machinery on every read, which adds up at sustained QPS
+        self._max_tokens = config.openai_max_tokens
+        self._temperature = config.openai_temperature
         self.memory = ConversationMemory()
         self.rate_limiter = RateLimiter()
+        # Deterministic completions (temperature 0) are safe to memoize -
+        # repeated verbatim conversations skip the Azure round-trip entirely
+        self._response_cache: LRUCache = LRUCache(maxsize=1024)
         
         # Default system message
         self.default_system_message = (
@@ -157,7 +308,70 @@ class AzureOpenAIService:
             "If you're unsure about something, be honest about it. "
             "Format your responses appropriately for Teams chat."
         )
+
+    _SERVICE_ERROR_MESSAGE = (
+        "I'm sorry, I'm having trouble connecting to my AI service right now. "
+        "Please try again in a moment."
+    )
+
+    def _record_failure(self, conversation_id: str) -> str:
+        """
+        Store and return the user-facing service-error message.
+
+        Args:
+            conversation_id: Unique conversation identifier
+
+        Returns:
+            The error message shown to the user
+        """
+        self.memory.add_message(conversation_id, "assistant", self._SERVICE_ERROR_MESSAGE)
+        return self._SERVICE_ERROR_MESSAGE
+
+    async def _sleep_with_jitter(self, wait_time: float):
+        """
+        Sleep for wait_time scaled by 0.5-1.5x to de-synchronize concurrent
+        retriers (no thundering herd after an upstream outage).
+
+        Args:
+            wait_time: Base wait time in seconds
+        """
+        wait_time *= 0.5 + random.random()
+        logger.info("Waiting %.2f seconds before retry", wait_time)
+        await asyncio.sleep(wait_time)
     
+    def _prepare_messages(
+        self,
+        message: str,
+        conversation_id: str,
+        user_name: str = None,
+        system_message: str = None
+    ) -> List[Dict[str, str]]:
+        """
+        Record the user message and build the API-shaped message list.
+
+        Args:
+            message: User message
+            conversation_id: Unique conversation identifier
+            user_name: Name of the user (optional)
+            system_message: Custom system message (optional)
+
+        Returns:
+            List of messages formatted for the OpenAI API
+        """
+        # Set system message if provided or use default
+        if system_message or conversation_id not in self.memory:
+            self.memory.set_system_message(
+                conversation_id,
+                system_message or self.default_system_message
+            )
+
+        # Add user message to conversation
+        self.memory.add_message(conversation_id, "user", message, {"user_name": user_name})
+
+        # The memory maintains the API-shaped view incrementally - no
+        # per-request projection rebuild
+        return self.memory.get_api_messages(conversation_id)
+
     async def get_chat_response(
         self,
         message: str,
@@ -168,49 +382,43 @@ class AzureOpenAIService:
     ) -> str:
         """
         Get a chat response from Azure OpenAI.
-        
+
         Args:
             message: User message
             conversation_id: Unique conversation identifier
             user_name: Name of the user (optional)
             system_message: Custom system message (optional)
             max_retries: Maximum number of retry attempts
-            
+
         Returns:
             AI response message
         """
-        # Set system message if provided or use default
-        if system_message or conversation_id not in [conv_id for conv_id in self.memory._conversations.keys()]:
-            self.memory.set_system_message(
-                conversation_id, 
-                system_message or self.default_system_message
-            )
-        
-        # Add user message to conversation
-        user_display_name = f" ({user_name})" if user_name else ""
-        self.memory.add_message(conversation_id, "user", message, {"user_name": user_name})
-        
-        # Get conversation history
-        conversation_history = self.memory.get_conversation(conversation_id)
-        
-        # Prepare messages for OpenAI API
-        messages = [
-            {"role": msg["role"], "content": msg["content"]}
-            for msg in conversation_history
-        ]
-        
+        messages = self._prepare_messages(message, conversation_id, user_name, system_message)
+
+        # Cache key only for deterministic requests
+        cache_key = None
+        if self._temperature == 0:
+            cache_key = hashlib.blake2b(
+                json.dumps(messages, sort_keys=True).encode()
+            ).digest()
+            cached_response = self._response_cache.get(cache_key)
+            if cached_response is not None:
+                self.memory.add_message(conversation_id, "assistant", cached_response)
+                logger.info("Returning cached response for deterministic request")
+                return cached_response
+
         # Retry logic
         for attempt in range(max_retries):
             try:
                 await self.rate_limiter.wait_if_needed()
                 
-                logger.info(f"Sending request to Azure OpenAI (attempt {attempt + 1})")
+                logger.info("Sending request to Azure OpenAI (attempt %d)", attempt + 1)
                 
-                response = self.client.chat.completions.create(
+                response = await self.client.chat.completions.create(
                     model=self.deployment_name,
                     messages=messages,
-                    max_tokens=config.openai_max_tokens,
-                    temperature=config.openai_temperature,
+                    max_tokens=self._max_tokens,
+                    temperature=self._temperature,
                     top_p=0.9,
                     frequency_penalty=0,
                     presence_penalty=0
@@ -220,30 +428,123 @@ class AzureOpenAIService:
                 
                 # Add assistant response to conversation
                 self.memory.add_message(conversation_id, "assistant", assistant_message)
-                
+
+                if cache_key is not None:
+                    self._response_cache[cache_key] = assistant_message
+
                 logger.info("Successfully received response from Azure OpenAI")
                 return assistant_message
                 
+            except RateLimitError as e:
+                logger.warning("Azure OpenAI rate limit hit (attempt %d): %s", attempt + 1, e)
+
+                if attempt == max_retries - 1:
+                    return self._record_failure(conversation_id)
+
+                # Honor the service's Retry-After hint when present
+                retry_after = None
+                if e.response is not None:
+                    retry_after = e.response.headers.get("retry-after")
+                try:
+                    wait_time = float(retry_after) if retry_after else float(2 ** attempt)
+                except ValueError:
+                    wait_time = float(2 ** attempt)
+                await self._sleep_with_jitter(wait_time)
+
+            except (asyncio.TimeoutError, APITimeoutError,
+                    httpx.HTTPError, APIConnectionError) as e:
+                logger.error("Upstream error calling Azure OpenAI (attempt %d): %s", attempt + 1, e)
+
+                if attempt == max_retries - 1:
+                    # Surface timeouts/transport failures so HTTP callers can
+                    # map them to retryable 408/502 responses; the Teams
+                    # handler catches these and sends its own friendly reply
+                    raise
+
+                await asyncio.sleep(RetryHelper.calculate_backoff(attempt, jitter=True))
+
+            except APIStatusError as e:
+                # Auth/permission failures won't heal on retry - fail fast
+                if e.status_code in (401, 403):
+                    logger.error("Non-retryable Azure OpenAI error (%s): %s", e.status_code, e)
+                    return self._record_failure(conversation_id)
+
+                logger.error("Error calling Azure OpenAI (attempt %d): %s", attempt + 1, e)
+
+                if attempt == max_retries - 1:
+                    return self._record_failure(conversation_id)
+
+                await asyncio.sleep(RetryHelper.calculate_backoff(attempt, jitter=True))
+
             except Exception as e:
-                logger.error(f"Error calling Azure OpenAI (attempt {attempt + 1}): {e}")
-                
+                logger.error("Error calling Azure OpenAI (attempt %d): %s", attempt + 1, e)
+
                 if attempt == max_retries - 1:
-                    # Last attempt failed
-                    error_message = (
-                        "I'm sorry, I'm having trouble connecting to my AI service right now. "
-                        "Please try again in a moment."
-                    )
-                    self.memory.add_message(conversation_id, "assistant", error_message)
-                    return error_message
-                
-                # Wait before retry (exponential backoff)
-                wait_time = 2 ** attempt
-                logger.info(f"Waiting {wait_time} seconds before retry")
-                await asyncio.sleep(wait_time)
+                    return self._record_failure(conversation_id)
+
+                await asyncio.sleep(RetryHelper.calculate_backoff(attempt, jitter=True))
         
         # This should never be reached, but just in case
         return "I'm sorry, I encountered an unexpected error. Please try again."
-    
+
+    async def get_chat_response_stream(
+        self,
+        message: str,
+        conversation_id: str,
+        user_name: str = None,
+        system_message: str = None
+    ):
+        """
+        Stream a chat response from Azure OpenAI as it is generated.
+
+        Args:
+            message: User message
+            conversation_id: Unique conversation identifier
+            user_name: Name of the user (optional)
+            system_message: Custom system message (optional)
+
+        Yields:
+            Response text fragments as they arrive from the model
+        """
+        messages = self._prepare_messages(message, conversation_id, user_name, system_message)
+
+        try:
+            await self.rate_limiter.wait_if_needed()
+
+            logger.info("Sending streaming request to Azure OpenAI")
+
+            response = await self.client.chat.completions.create(
+                model=self.deployment_name,
+                messages=messages,
+                max_tokens=self._max_tokens,
+                temperature=self._temperature,
+                top_p=0.9,
+                frequency_penalty=0,
+                presence_penalty=0,
+                stream=True
+            )
+
+            parts = []
+            async for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    content = chunk.choices[0].delta.content
+                    parts.append(content)
+                    yield content
+
+            # Record the full response once the stream completes
+            self.memory.add_message(conversation_id, "assistant", "".join(parts))
+
+            logger.info("Successfully streamed response from Azure OpenAI")
+
+        except Exception as e:
+            logger.error("Error streaming from Azure OpenAI: %s", e)
+            error_message = (
+                "I'm sorry, I'm having trouble connecting to my AI service right now. "
+                "Please try again in a moment."
+            )
+            self.memory.add_message(conversation_id, "assistant", error_message)
+            yield error_message
+
     def clear_conversation(self, conversation_id: str):
         """
         Clear conversation history.
@@ -252,7 +553,7 @@ class AzureOpenAIService:
             conversation_id: Unique conversation identifier
         """
         self.memory.clear_conversation(conversation_id)
-        logger.info(f"Cleared conversation history for {conversation_id}")
+        logger.info("Cleared conversation history for %s", conversation_id)
     
     def get_conversation_summary(self, conversation_id: str) -> Dict[str, Any]:
         """
@@ -264,29 +565,48 @@ class AzureOpenAIService:
         Returns:
             Dictionary with conversation summary
         """
-        conversation = self.memory.get_conversation(conversation_id)
-        
-        if not conversation:
+        # Single fused pass over a lazy iterator - no merged list is ever
+        # materialized for the summary
+        message_count = 0
+        user_count = 0
+        assistant_count = 0
+        participants = set()
+        ts_min = ts_max = None
+
+        for msg in self.memory.iter_messages(conversation_id):
+            message_count += 1
+
+            role = msg["role"]
+            if role == "user":
+                user_count += 1
+                user_name = msg.get("user_name")
+                if user_name:
+                    participants.add(user_name)
+            elif role == "assistant":
+                assistant_count += 1
+
+            timestamp = msg["timestamp"]
+            if ts_min is None:
+                ts_min = ts_max = timestamp
+            elif timestamp < ts_min:
+                ts_min = timestamp
+            elif timestamp > ts_max:
+                ts_max = timestamp
+
+        if message_count == 0:
             return {"message_count": 0, "participants": []}
-        
-        user_messages = [msg for msg in conversation if msg["role"] == "user"]
-        assistant_messages = [msg for msg in conversation if msg["role"] == "assistant"]
-        
-        participants = list(set([
-            msg.get("user_name", "Unknown") 
-            for msg in user_messages 
-            if msg.get("user_name")
-        ]))
-        
+
         return {
-            "message_count": len(conversation),
-            "user_messages": len(user_messages),
-            "assistant_messages": len(assistant_messages),
-            "participants": participants,
-            "start_time": min(msg["timestamp"] for msg in conversation) if conversation else None,
-            "last_activity": max(msg["timestamp"] for msg in conversation) if conversation else None
+            "message_count": message_count,
+            "user_messages": user_count,
+            "assistant_messages": assistant_count,
+            "participants": list(participants),
+            "start_time": ts_min,
+            "last_activity": ts_max
         }
 
 
-# Global service instance
+# Global service instance. Must stay a process-wide singleton: it owns the
+# shared HTTP connection pool, so per-request construction would throw away
+# warm TCP/TLS sessions.
 openai_service = AzureOpenAIService()
\ No newline at end of file
@@ -1,34 +1,152 @@
 """Utility functions for the Azure Teams chatbot."""
+import atexit
+import functools
 import logging
+import queue
+import random
 import re
-import uuid
+import secrets
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
 
+# Precompiled patterns: module-level so the re-cache lookup and parse never
+# run on the per-message hot paths (sanitize/mask/validate fire on every
+# inbound chat message)
+# Sanitizer passes: tags first, then injection keywords on the tag-stripped
+# output. The order is load-bearing - tag removal can reconstruct keyword
+# fragments (e.g. 'j<b></b>avascript:'), so the keyword pass must run after
+# it, not fused with it. Whitespace collapse happens via str.split/join,
+# which is a plain C loop and beats the regex engine for that job.
+_TAG_RE = re.compile(r'<[^>]+>')
+_INJECTION_RE = re.compile(r'(javascript:)|(on\w+\s*=)', re.IGNORECASE)
+
+# Conversation ID validator with the length bound inlined - fullmatch is a
+# single C-level call and, unlike the set-difference approach, allocates
+# nothing per call
+_CONV_ID_RE = re.compile(r'[a-zA-Z0-9_-]{1,100}')
+# One alternation for mask_sensitive_data with group-dispatched
+# replacements; credit cards sit before the API-key group so long digit
+# runs are masked as cards, matching the old sequential-pass semantics
+_MASK_RE = re.compile(
+    r'(?P<email>\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b)'
+    r'|(?P<phone>\b\d{3}[-.]?\d{3}[-.]?\d{4}\b)'
+    r'|(?P<cc>\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b)'
+    # Bounded at 128 so base64 blobs (images, JWT payloads) never drag the
+    # engine through an unbounded greedy run
+    r'|(?P<key>\b[A-Za-z0-9]{32,128}\b)'
+)
+_MASKS = {
+    'email': '***@***.***',
+    'phone': '***-***-****',
+    'cc': '****-****-****-****',
+    'key': '***API_KEY***',
+}
+
+# Characters required for the email/phone/cc patterns to fire. The API-key
+# pattern can match letter-only runs, so the fast path below may only skip
+# texts too short (<32 chars) for that group to match at all.
+_MASK_TRIGGERS = frozenset('@0123456789')
+
+_FILE_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+# The ubiquitous display format gets an isoformat fast path
+_DEFAULT_TS_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Shared happy-path result for health_check_azure_openai - no per-probe dict
+_HEALTHY = {"status": "healthy"}
+
+# Listener thread draining queued log records; kept module-level so atexit
+# can stop it cleanly
+_log_listener: Optional[QueueListener] = None
+
+# Frozen skeleton for create_adaptive_card - the per-call copies reuse the
+# interned key strings and halve the dict construction
+_CARD_TEMPLATE = {
+    "type": "AdaptiveCard",
+    "version": "1.3",
+    "body": [
+        {
+            "type": "TextBlock",
+            "size": "Medium",
+            "weight": "Bolder"
+        },
+        {
+            "type": "TextBlock",
+            "wrap": True
+        }
+    ]
+}
+
+
+@functools.lru_cache(maxsize=32)
+def _mention_pattern(bot_name: str) -> re.Pattern:
+    """
+    Compiled union mention pattern for a bot name, cached per name.
+
+    IGNORECASE already covers the case variants, so one union pattern
+    replaces the former five per-variant patterns.
+
+    Args:
+        bot_name: Name of the bot to look for
+
+    Returns:
+        Compiled mention pattern
+    """
+    return re.compile(rf'@(?:{re.escape(bot_name)}|assistant|bot)\s*', re.IGNORECASE)
+
 
 def setup_logging(log_level: str = "INFO", log_format: str = None) -> logging.Logger:
     """
-    Set up logging configuration.
-    
+    Set up logging configuration (idempotent).
+
     Args:
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_format: Custom logging format
-        
+
     Returns:
         Configured logger instance
     """
+    global _log_listener
+
+    root = logging.getLogger()
+    if root.handlers:
+        # Already configured (repeated imports/tests land here) - don't open
+        # another file descriptor or stack duplicate handlers
+        return logging.getLogger(__name__)
+
     if log_format is None:
         log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    
+
+    # Producers only pay a queue put; the listener thread drains to the
+    # stream and file handlers so no request thread blocks on write()
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    # delay=True defers opening the fd until the first record is written;
+    # rotation keeps the log bounded
+    file_handler = RotatingFileHandler(
+        "chatbot.log", maxBytes=10_000_000, backupCount=3, delay=True
+    )
+
+    _log_listener = QueueListener(
+        log_queue, stream_handler, file_handler, respect_handler_level=True
+    )
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
     logging.basicConfig(
         level=getattr(logging, log_level.upper()),
         format=log_format,
-        handlers=[
-            logging.StreamHandler(),
-            logging.FileHandler("chatbot.log")
-        ]
+        handlers=[QueueHandler(log_queue)]
     )
-    
+
+    # Skip per-record thread/process introspection - a real per-call win in
+    # a high-QPS bot
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
     return logging.getLogger(__name__)
 
 
@@ -42,7 +160,9 @@ def generate_conversation_id(prefix: str = "conv") -> str:
     Returns:
         Unique conversation ID
     """
-    return f"{prefix}-{uuid.uuid4().hex[:8]}"
+    # Exactly 4 CSPRNG bytes formatted as 8 hex chars - same entropy window
+    # as the old uuid4().hex[:8] without building and slicing a UUID
+    return f"{prefix}-{secrets.token_hex(4)}"
 
 
 def sanitize_user_input(text: str, max_length: int = 4000) -> str:
@@ -58,38 +178,45 @@ def sanitize_user_input(text: str, max_length: int = 4000) -> str:
     """
     if not text:
         return ""
-    
-    # Remove excessive whitespace
-    text = re.sub(r'\s+', ' ', text.strip())
-    
-    # Truncate if too long
-    if len(text) > max_length:
-        text = text[:max_length]
-    
-    # Remove potential HTML/XML tags
-    text = re.sub(r'<[^>]+>', '', text)
-    
-    # Remove potential script injections
-    text = re.sub(r'javascript:', '', text, flags=re.IGNORECASE)
-    text = re.sub(r'on\w+\s*=', '', text, flags=re.IGNORECASE)
-    
-    return text
+
+    # Truncate first to bound the work, collapse whitespace with split/join,
+    # then strip tags and injection keywords in two bounded passes
+    text = ' '.join(text[:max_length].split())
+    text = _TAG_RE.sub('', text)
+    return _INJECTION_RE.sub('', text)
 
 
-def format_timestamp(timestamp: datetime, format_str: str = "%Y-%m-%d %H:%M:%S") -> str:
+def format_timestamp(timestamp: datetime, format_str: str = _DEFAULT_TS_FORMAT) -> str:
     """
     Format timestamp for display.
-    
+
     Args:
         timestamp: Datetime object to format
         format_str: Format string for datetime formatting
-        
+
     Returns:
         Formatted timestamp string
     """
+    # For naive datetimes, isoformat produces byte-identical output for the
+    # default format via a direct C formatter, skipping strftime's directive
+    # interpretation (aware datetimes would gain a UTC-offset suffix)
+    if format_str == _DEFAULT_TS_FORMAT and timestamp.tzinfo is None:
+        return timestamp.isoformat(sep=' ', timespec='seconds')
+
+    # Log-burst memo: many callers format the same second repeatedly. Only
+    # safe for naive datetimes and formats without sub-second fields.
+    if timestamp.tzinfo is None and '%f' not in format_str:
+        return _format_epoch(int(timestamp.timestamp()), format_str)
+
     return timestamp.strftime(format_str)
 
 
+@functools.lru_cache(maxsize=1024)
+def _format_epoch(epoch_seconds: int, format_str: str) -> str:
+    """Format a second-resolution epoch stamp, memoized across calls."""
+    return datetime.fromtimestamp(epoch_seconds).strftime(format_str)
+
+
 def calculate_duration(start_time: datetime, end_time: datetime = None) -> Dict[str, Any]:
     """
     Calculate duration between two timestamps.
@@ -105,12 +232,13 @@ def calculate_duration(start_time: datetime, end_time: datetime = None) -> Dict[
         end_time = datetime.now()
     
     duration = end_time - start_time
-    
+
     total_seconds = duration.total_seconds()
-    hours = int(total_seconds // 3600)
-    minutes = int((total_seconds % 3600) // 60)
-    seconds = int(total_seconds % 60)
-    
+    # Integer divmod chain keeps the split on the int fast path instead of
+    # three float floor-divisions/modulos
+    hours, remainder = divmod(int(total_seconds), 3600)
+    minutes, seconds = divmod(remainder, 60)
+
     return {
         "total_seconds": total_seconds,
         "hours": hours,
@@ -130,12 +258,13 @@ def validate_conversation_id(conversation_id: str) -> bool:
     Returns:
         True if valid, False otherwise
     """
-    if not conversation_id:
-        return False
-    
-    # Allow alphanumeric characters, hyphens, and underscores
-    pattern = r'^[a-zA-Z0-9_-]+$'
-    return bool(re.match(pattern, conversation_id)) and len(conversation_id) <= 100
+    # Allow alphanumeric characters, hyphens, and underscores; the length
+    # guard rejects oversized IDs in O(1) before the engine is touched
+    return (
+        bool(conversation_id)
+        and len(conversation_id) <= 100
+        and _CONV_ID_RE.fullmatch(conversation_id) is not None
+    )
 
 
 def extract_mention(text: str, bot_name: str = "assistant") -> tuple[str, bool]:
@@ -151,26 +280,19 @@ def extract_mention(text: str, bot_name: str = "assistant") -> tuple[str, bool]:
     """
     if not text:
         return "", False
-    
-    # Look for @bot_name or similar patterns
-    mention_patterns = [
-        rf'@{re.escape(bot_name)}\s*',
-        rf'@{re.escape(bot_name.lower())}\s*',
-        rf'@{re.escape(bot_name.upper())}\s*',
-        r'@assistant\s*',
-        r'@bot\s*'
-    ]
-    
-    was_mentioned = False
-    clean_text = text
-    
-    for pattern in mention_patterns:
-        if re.search(pattern, text, re.IGNORECASE):
-            was_mentioned = True
-            clean_text = re.sub(pattern, '', text, flags=re.IGNORECASE).strip()
-            break
-    
-    return clean_text, was_mentioned
+
+    # Most messages contain no '@' at all - one C-level scan skips the
+    # regex engine entirely for them
+    if '@' not in text:
+        return text, False
+
+    # Search and replace in one pass with the cached union pattern;
+    # lowercasing the name canonicalizes the cache key (IGNORECASE already
+    # covers the match itself)
+    clean_text, num_matches = _mention_pattern(bot_name.lower()).subn('', text)
+    if not num_matches:
+        return text, False
+    return clean_text.strip(), True
 
 
 def truncate_text(text: str, max_length: int, suffix: str = "...") -> str:
@@ -185,13 +307,16 @@ def truncate_text(text: str, max_length: int, suffix: str = "...") -> str:
     Returns:
         Truncated text
     """
-    if not text or len(text) <= max_length:
-        return text
-    
-    if max_length <= len(suffix):
+    # Common case first: nothing to do after two comparisons
+    length = len(text) if text else 0
+    if length <= max_length:
+        return text or ""
+
+    suffix_length = len(suffix)
+    if max_length <= suffix_length:
         return suffix[:max_length]
-    
-    return text[:max_length - len(suffix)] + suffix
+
+    return f"{text[:max_length - suffix_length]}{suffix}"
 
 
 def mask_sensitive_data(text: str) -> str:
@@ -204,21 +329,14 @@ def mask_sensitive_data(text: str) -> str:
     Returns:
         Text with sensitive data masked
     """
-    # Mask email addresses
-    text = re.sub(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', 
-                  '***@***.***', text)
-    
-    # Mask phone numbers (basic patterns)
-    text = re.sub(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', '***-***-****', text)
-    
-    # Mask credit card numbers (basic pattern)
-    text = re.sub(r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b', 
-                  '****-****-****-****', text)
-    
-    # Mask API keys (common patterns)
-    text = re.sub(r'\b[A-Za-z0-9]{32,}\b', '***API_KEY***', text)
-    
-    return text
+    # Early exit when nothing can match: email needs '@', phone/cc need
+    # digits, and the key group needs at least 32 characters - so a short
+    # text without trigger characters is provably clean
+    if len(text) < 32 and not any(c in _MASK_TRIGGERS for c in text):
+        return text
+
+    # One pass over the text; the matched group picks the mask
+    return _MASK_RE.sub(lambda m: _MASKS[m.lastgroup], text)
 
 
 def create_adaptive_card(title: str, content: str, actions: list = None) -> Dict[str, Any]:
@@ -233,46 +351,42 @@ def create_adaptive_card(title: str, content: str, actions: list = None) -> Dict
     Returns:
         Adaptive card dictionary
     """
+    title_block, content_block = _CARD_TEMPLATE["body"]
     card = {
-        "type": "AdaptiveCard",
-        "version": "1.3",
+        **_CARD_TEMPLATE,
         "body": [
-            {
-                "type": "TextBlock",
-                "text": title,
-                "size": "Medium",
-                "weight": "Bolder"
-            },
-            {
-                "type": "TextBlock",
-                "text": content,
-                "wrap": True
-            }
+            {**title_block, "text": title},
+            {**content_block, "text": content}
         ]
     }
-    
+
     if actions:
         card["actions"] = actions
-    
+
     return card
 
 
-def is_rate_limited(last_request_time: datetime, min_interval_seconds: int = 1) -> bool:
+def is_rate_limited(last_request_time, min_interval_seconds: int = 1) -> bool:
     """
     Check if request should be rate limited.
-    
+
     Args:
-        last_request_time: Timestamp of last request
+        last_request_time: time.monotonic() stamp of the last request
+            (preferred - one clock read, no allocation) or a legacy datetime
         min_interval_seconds: Minimum interval between requests
-        
+
     Returns:
         True if should be rate limited, False otherwise
     """
     if not last_request_time:
         return False
-    
-    time_since_last = datetime.now() - last_request_time
-    return time_since_last.total_seconds() < min_interval_seconds
+
+    # Backward-compatible datetime path for existing callers
+    if isinstance(last_request_time, datetime):
+        return (datetime.now() - last_request_time).total_seconds() < min_interval_seconds
+
+    # Monotonic stamps: immune to wall-clock jumps, no timedelta built
+    return (time.monotonic() - last_request_time) < min_interval_seconds
 
 
 def health_check_azure_openai(endpoint: str, api_key: str) -> Dict[str, Any]:
@@ -284,22 +398,19 @@ def health_check_azure_openai(endpoint: str, api_key: str) -> Dict[str, Any]:
         api_key: API key
         
     Returns:
-        Health check result
+        Health check result (callers must not mutate the healthy result)
     """
-    try:
-        # This is a basic check - in a real implementation, you might
-        # want to make a simple API call to verify connectivity
-        if not endpoint or not api_key:
-            return {"status": "unhealthy", "error": "Missing configuration"}
-        
-        # Basic URL validation
-        if not endpoint.startswith("https://"):
-            return {"status": "unhealthy", "error": "Invalid endpoint URL"}
-        
-        return {"status": "healthy"}
-    
-    except Exception as e:
-        return {"status": "unhealthy", "error": str(e)}
+    # This is a basic check - in a real implementation, you might want to
+    # make a simple API call to verify connectivity. Nothing here can raise,
+    # so no try-frame on this per-probe path.
+    if not endpoint or not api_key:
+        return {"status": "unhealthy", "error": "Missing configuration"}
+
+    # Basic URL validation
+    if not endpoint.startswith("https://"):
+        return {"status": "unhealthy", "error": "Invalid endpoint URL"}
+
+    return _HEALTHY
 
 
 def format_file_size(size_bytes: int) -> str:
@@ -312,38 +423,48 @@ def format_file_size(size_bytes: int) -> str:
     Returns:
         Formatted size string
     """
-    if size_bytes == 0:
+    if size_bytes <= 0:
         return "0 B"
-    
-    units = ["B", "KB", "MB", "GB", "TB"]
-    unit_index = 0
-    size = float(size_bytes)
-    
-    while size >= 1024 and unit_index < len(units) - 1:
-        size /= 1024
-        unit_index += 1
-    
-    return f"{size:.1f} {units[unit_index]}"
+
+    # bit_length picks the unit in O(1) - no loop, one float division
+    unit_index = min((size_bytes.bit_length() - 1) // 10, len(_FILE_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (unit_index * 10)):.1f} {_FILE_SIZE_UNITS[unit_index]}"
 
 
 class RetryHelper:
     """Helper class for implementing retry logic."""
-    
+
     @staticmethod
-    def calculate_backoff(attempt: int, base_delay: float = 1.0, max_delay: float = 60.0) -> float:
+    def calculate_backoff(
+        attempt: int,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        jitter: bool = False
+    ) -> float:
         """
         Calculate exponential backoff delay.
-        
+
         Args:
             attempt: Attempt number (0-based)
             base_delay: Base delay in seconds
             max_delay: Maximum delay in seconds
-            
+            jitter: Apply full jitter so concurrent callers don't retry in
+                lockstep after an upstream outage (recommended for real
+                retry paths; off by default for deterministic callers)
+
         Returns:
             Delay in seconds
         """
-        delay = base_delay * (2 ** attempt)
-        return min(delay, max_delay)
+        # Bit-shift instead of int.__pow__; any attempt this deep is capped
+        # by max_delay anyway
+        if attempt >= 32:
+            delay = max_delay
+        else:
+            delay = min(base_delay * float(1 << attempt), max_delay)
+
+        if jitter:
+            return random.uniform(0, delay)
+        return delay
     
     @staticmethod
     def should_retry(exception: Exception, attempt: int, max_attempts: int = 3) -> bool:
@@ -1,5 +1,5 @@
 #!/bin/bash
-# Azure App Service startup script for Python Flask app
+# Azure App Service startup script for the Quart app
 
 # Activate virtual environment if it exists
 if [ -d "antenv" ]; then
@@ -11,6 +11,6 @@ if [ -f "requirements.txt" ]; then
     pip install -r requirements.txt
 fi
 
-# Start the Flask app with gunicorn for production
+# Start the app with gunicorn + uvicorn workers for production
 export FLASK_ENV=production
-gunicorn app:app --bind=0.0.0.0:8000
+gunicorn -c gunicorn.conf.py app:app
@@ -0,0 +1,109 @@
+let conversationId = 'web-' + Math.random().toString(36).substr(2, 9);
+
+function addMessage(content, isUser = false) {
+    const chatContainer = document.getElementById('chatContainer');
+    const messageDiv = document.createElement('div');
+    messageDiv.className = 'message ' + (isUser ? 'user-message' : 'bot-message');
+    messageDiv.textContent = content;
+    chatContainer.appendChild(messageDiv);
+    chatContainer.scrollTop = chatContainer.scrollHeight;
+    return messageDiv;
+}
+
+function showStatus(message, type = '') {
+    const statusDiv = document.getElementById('status');
+    statusDiv.textContent = message;
+    statusDiv.className = 'status ' + type;
+    if (type === '') {
+        setTimeout(() => {
+            statusDiv.textContent = '';
+            statusDiv.className = 'status';
+        }, 3000);
+    }
+}
+
+let inFlightController = null;
+let sendDebounceTimer = null;
+
+function sendMessage() {
+    // Coalesce rapid Enter/click bursts into one request
+    clearTimeout(sendDebounceTimer);
+    sendDebounceTimer = setTimeout(doSendMessage, 30);
+}
+
+async function doSendMessage() {
+    const input = document.getElementById('messageInput');
+    const sendButton = document.getElementById('sendButton');
+    const message = input.value.trim();
+
+    if (!message) return;
+
+    // Abort any still-running request before starting a new one
+    if (inFlightController) inFlightController.abort();
+    inFlightController = new AbortController();
+
+    // Add user message to chat
+    addMessage(message, true);
+
+    // Clear input and disable send button
+    input.value = '';
+    sendButton.disabled = true;
+    showStatus('Thinking...', 'loading');
+
+    try {
+        const response = await fetch('/api/chat/stream', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+                message: message,
+                conversation_id: conversationId,
+                user_name: 'Web User'
+            }),
+            signal: inFlightController.signal
+        });
+
+        if (response.ok) {
+            // Append streamed deltas to one bot message bubble as they arrive
+            const bubble = addMessage('');
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            for (;;) {
+                const { done, value } = await reader.read();
+                if (done) break;
+                buffer += decoder.decode(value, { stream: true });
+                const events = buffer.split('\n\n');
+                buffer = events.pop();
+                for (const event of events) {
+                    if (!event.startsWith('data: ')) continue;
+                    const payload = event.slice(6);
+                    if (payload === '[DONE]') continue;
+                    const data = JSON.parse(payload);
+                    if (data.delta) {
+                        bubble.textContent += data.delta;
+                    } else if (data.error) {
+                        bubble.textContent = 'Error: ' + data.error;
+                    }
+                }
+            }
+            showStatus('');
+        } else {
+            const data = await response.json();
+            addMessage('Error: ' + (data.error || 'Unknown error occurred'));
+            showStatus('Error sending message', 'error');
+        }
+    } catch (error) {
+        if (error.name !== 'AbortError') {
+            addMessage('Error: Failed to connect to the chatbot service');
+            showStatus('Connection error', 'error');
+        }
+    }
+
+    sendButton.disabled = false;
+    input.focus();
+}
+
+// Focus on input when page loads
+document.getElementById('messageInput').focus();
@@ -7,9 +7,9 @@ from unittest.mock import patch
 os.environ['FLASK_ENV'] = 'testing'
 os.environ['LOG_LEVEL'] = 'DEBUG'
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def mock_config():
-    """Mock configuration for testing."""
+    """Mock configuration for testing (static values - one setup per run)."""
     with patch('src.config.config') as mock:
         mock.azure_openai_endpoint = 'https://test.openai.azure.com/'
         mock.azure_openai_api_key = 'test-key'
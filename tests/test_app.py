@@ -1,90 +1,136 @@
-"""Test Flask application endpoints."""
+"""Test Quart application endpoints."""
 import pytest
 import json
 from unittest.mock import patch, MagicMock, AsyncMock
 from app import app
 
 
-class TestFlaskApplication:
-    """Test Flask application endpoints."""
-    
-    @pytest.fixture
+class TestQuartApplication:
+    """Test Quart application endpoints."""
+
+    @pytest.fixture(scope='module')
     def client(self):
-        """Create test client."""
+        """Create test client once per module - app state is stateless
+        across these tests, so rebuilding it per test is pure overhead."""
         app.config['TESTING'] = True
-        with app.test_client() as client:
-            yield client
-    
-    def test_home_endpoint(self, client):
+        return app.test_client()
+
+    async def test_home_endpoint(self, client):
         """Test home endpoint returns web interface."""
-        response = client.get('/')
-        
+        response = await client.get('/')
+
         assert response.status_code == 200
-        assert b'Azure Teams AI Chatbot' in response.data
-        assert b'Test the Chatbot:' in response.data
-    
-    def test_health_endpoint(self, client):
+        data = await response.get_data()
+        assert b'Azure Teams AI Chatbot' in data
+        assert b'Test the Chatbot:' in data
+
+    async def test_health_endpoint(self, client):
         """Test health check endpoint."""
-        response = client.get('/health')
-        
+        response = await client.get('/health')
+
         assert response.status_code in [200, 503]  # May be degraded due to missing config
-        
-        data = json.loads(response.data)
+
+        data = await response.get_json()
         assert 'status' in data
         assert 'service' in data
         assert 'components' in data
         assert data['service'] == 'Azure Teams AI Chatbot'
-    
-    @patch('src.services.openai_service.openai_service')
-    def test_chat_endpoint_success(self, mock_openai_service, client):
+
+    @patch('app.openai_service')
+    async def test_chat_endpoint_success(self, mock_openai_service, client):
         """Test chat endpoint with successful response."""
         # Setup mock
         mock_openai_service.get_chat_response = AsyncMock(return_value="Test response")
-        
-        response = client.post('/api/chat', 
-                             json={
-                                 'message': 'Hello',
-                                 'conversation_id': 'test-conv',
-                                 'user_name': 'Test User'
-                             })
-        
+
+        response = await client.post('/api/chat',
+                                     json={
+                                         'message': 'Hello',
+                                         'conversation_id': 'test-conv',
+                                         'user_name': 'Test User'
+                                     })
+
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = await response.get_json()
         assert data['response'] == 'Test response'
         assert data['conversation_id'] == 'test-conv'
-    
-    def test_chat_endpoint_missing_message(self, client):
+
+    async def test_chat_endpoint_missing_message(self, client):
         """Test chat endpoint with missing message."""
-        response = client.post('/api/chat', json={})
-        
+        response = await client.post('/api/chat', json={})
+
         assert response.status_code == 400
-        data = json.loads(response.data)
+        data = await response.get_json()
         assert 'error' in data
         assert 'Message is required' in data['error']
-    
-    def test_chat_endpoint_invalid_json(self, client):
+
+    async def test_chat_endpoint_invalid_json(self, client):
         """Test chat endpoint with invalid JSON."""
-        response = client.post('/api/chat', 
-                             data='invalid json',
-                             content_type='application/json')
-        
+        response = await client.post('/api/chat',
+                                     data='invalid json',
+                                     headers={'Content-Type': 'application/json'})
+
         assert response.status_code == 400
-    
-    @patch('src.services.openai_service.openai_service')
-    def test_clear_conversation_endpoint(self, mock_openai_service, client):
+
+    @patch('app.openai_service')
+    async def test_chat_stream_endpoint(self, mock_openai_service, client):
+        """Test streaming chat endpoint emits SSE delta frames and [DONE]."""
+        async def fake_stream(**kwargs):
+            yield "Hello "
+            yield "world"
+
+        mock_openai_service.get_chat_response_stream = fake_stream
+
+        response = await client.post('/api/chat/stream',
+                                     json={
+                                         'message': 'Hello',
+                                         'conversation_id': 'test-conv',
+                                         'user_name': 'Test User'
+                                     })
+
+        assert response.status_code == 200
+        assert response.headers['Content-Type'].startswith('text/event-stream')
+
+        data = await response.get_data()
+        assert b'data: {"delta":"Hello "}\n\n' in data
+        assert b'data: {"delta":"world"}\n\n' in data
+        assert data.endswith(b'data: [DONE]\n\n')
+
+    @patch('app.openai_service')
+    async def test_chat_stream_endpoint_error(self, mock_openai_service, client):
+        """Test streaming chat endpoint reports mid-stream failures."""
+        async def failing_stream(**kwargs):
+            yield "partial"
+            raise RuntimeError("stream blew up")
+
+        mock_openai_service.get_chat_response_stream = failing_stream
+
+        response = await client.post('/api/chat/stream',
+                                     json={
+                                         'message': 'Hello',
+                                         'conversation_id': 'test-conv'
+                                     })
+
+        assert response.status_code == 200
+        data = await response.get_data()
+        assert b'data: {"delta":"partial"}\n\n' in data
+        assert b'data: {"error":"Internal server error"}\n\n' in data
+        assert data.endswith(b'data: [DONE]\n\n')
+
+    @patch('app.openai_service')
+    async def test_clear_conversation_endpoint(self, mock_openai_service, client):
         """Test clear conversation endpoint."""
         mock_openai_service.clear_conversation = MagicMock()
-        
-        response = client.post('/api/conversation/test-conv/clear')
-        
+
+        response = await client.post('/api/conversation/test-conv/clear')
+
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = await response.get_json()
         assert data['status'] == 'cleared'
         assert data['conversation_id'] == 'test-conv'
         mock_openai_service.clear_conversation.assert_called_once_with('test-conv')
-    
-    @patch('src.services.openai_service.openai_service')
-    def test_conversation_summary_endpoint(self, mock_openai_service, client):
+
+    @patch('app.openai_service')
+    async def test_conversation_summary_endpoint(self, mock_openai_service, client):
         """Test conversation summary endpoint."""
         mock_summary = {
             'message_count': 5,
@@ -93,27 +139,27 @@ class TestFlaskApplication:
             'participants': ['Test User']
         }
         mock_openai_service.get_conversation_summary.return_value = mock_summary
-        
-        response = client.get('/api/conversation/test-conv/summary')
-        
+
+        response = await client.get('/api/conversation/test-conv/summary')
+
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = await response.get_json()
         assert data == mock_summary
         mock_openai_service.get_conversation_summary.assert_called_once_with('test-conv')
-    
-    def test_not_found_endpoint(self, client):
+
+    async def test_not_found_endpoint(self, client):
         """Test 404 error handling."""
-        response = client.get('/nonexistent')
-        
+        response = await client.get('/nonexistent')
+
         assert response.status_code == 404
-        data = json.loads(response.data)
+        data = await response.get_json()
         assert data['error'] == 'Not found'
-    
+
     @patch('app.adapter')
-    def test_messages_endpoint_bot_framework(self, mock_adapter, client):
+    async def test_messages_endpoint_bot_framework(self, mock_adapter, client):
         """Test Bot Framework messages endpoint."""
         mock_adapter.process_activity = AsyncMock()
-        
+
         activity_data = {
             'type': 'message',
             'text': 'Hello bot',
@@ -121,53 +167,55 @@ class TestFlaskApplication:
             'conversation': {'id': 'conv123'},
             'recipient': {'id': 'bot123', 'name': 'Test Bot'}
         }
-        
-        response = client.post('/api/messages',
-                             json=activity_data,
-                             headers={'Authorization': 'Bearer test-token'})
-        
+
+        response = await client.post('/api/messages',
+                                     json=activity_data,
+                                     headers={'Authorization': 'Bearer test-token'})
+
         # The endpoint should process the activity
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = await response.get_json()
         assert data['status'] == 'ok'
 
 
 class TestHealthCheckDetails:
     """Test detailed health check functionality."""
-    
-    @pytest.fixture
+
+    @pytest.fixture(scope='module')
     def client(self):
-        """Create test client."""
+        """Create test client once per module - app state is stateless
+        across these tests, so rebuilding it per test is pure overhead."""
         app.config['TESTING'] = True
-        with app.test_client() as client:
-            yield client
-    
-    @patch('src.config.config')
-    def test_health_check_healthy_config(self, mock_config, client):
+        return app.test_client()
+
+    async def test_health_check_healthy_config(self, client):
         """Test health check with complete configuration."""
-        mock_config.azure_openai_endpoint = 'https://test.openai.azure.com/'
-        mock_config.azure_openai_api_key = 'test-key'
-        mock_config.microsoft_app_id = 'test-app-id'
-        mock_config.microsoft_app_password = 'test-password'
-        
-        response = client.get('/health')
-        
+        with patch.multiple('app',
+                            AOAI_ENDPOINT='https://test.openai.azure.com/',
+                            AOAI_API_KEY='test-key',
+                            APP_ID='test-app-id',
+                            APP_PASSWORD='test-password',
+                            IS_MANAGED_IDENTITY_MODE=False,
+                            IS_APP_ID_PASSWORD_MODE=True):
+            response = await client.get('/health')
+
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = await response.get_json()
         assert data['status'] == 'healthy'
         assert data['components']['azure_openai'] == 'ok'
         assert data['components']['configuration'] == 'ok'
-    
-    @patch('src.config.config')
-    def test_health_check_degraded_config(self, mock_config, client):
+
+    async def test_health_check_degraded_config(self, client):
         """Test health check with incomplete configuration."""
-        mock_config.azure_openai_endpoint = ''
-        mock_config.azure_openai_api_key = ''
-        mock_config.microsoft_app_id = ''
-        mock_config.microsoft_app_password = ''
-        
-        response = client.get('/health')
-        
+        with patch.multiple('app',
+                            AOAI_ENDPOINT='',
+                            AOAI_API_KEY='',
+                            APP_ID='',
+                            APP_PASSWORD='',
+                            IS_MANAGED_IDENTITY_MODE=False,
+                            IS_APP_ID_PASSWORD_MODE=False):
+            response = await client.get('/health')
+
         assert response.status_code == 503
-        data = json.loads(response.data)
-        assert data['status'] == 'degraded'
\ No newline at end of file
+        data = await response.get_json()
+        assert data['status'] == 'degraded'
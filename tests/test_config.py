@@ -65,9 +65,10 @@ class TestConfig:
         
         config = Config()
         result = config.get_secret('test-key')
-        
+
         assert result == 'secret-value'
-        mock_client.get_secret.assert_called_once_with('test-key')
+        # Startup prefetch also hits Key Vault, so assert on this key only
+        mock_client.get_secret.assert_any_call('test-key')
     
     @patch.dict(os.environ, {'TEST_ENV_VAR': 'env-value'})
     def test_get_secret_fallback_to_env(self):
@@ -1,5 +1,6 @@
 """Test utility functions."""
 import pytest
+import time
 from datetime import datetime, timedelta
 from src.utils import (
     generate_conversation_id,
@@ -169,18 +170,16 @@ class TestUtilityFunctions:
     
     def test_is_rate_limited(self):
         """Test rate limiting check."""
-        now = datetime.now()
-        
+        now = time.monotonic()
+
         # No previous request
         assert is_rate_limited(None) is False
-        
+
         # Recent request (should be limited)
-        recent = now - timedelta(seconds=0.5)
-        assert is_rate_limited(recent, min_interval_seconds=1) is True
-        
+        assert is_rate_limited(now - 0.5, min_interval_seconds=1) is True
+
         # Old request (should not be limited)
-        old = now - timedelta(seconds=2)
-        assert is_rate_limited(old, min_interval_seconds=1) is False
+        assert is_rate_limited(now - 2, min_interval_seconds=1) is False
 
 
 class TestRetryHelper:
@@ -188,18 +187,22 @@ class TestRetryHelper:
     
     def test_calculate_backoff(self):
         """Test exponential backoff calculation."""
-        # Test increasing delays
+        # Deterministic without jitter
         delay1 = RetryHelper.calculate_backoff(0, base_delay=1.0)
         delay2 = RetryHelper.calculate_backoff(1, base_delay=1.0)
         delay3 = RetryHelper.calculate_backoff(2, base_delay=1.0)
-        
+
         assert delay1 == 1.0
         assert delay2 == 2.0
         assert delay3 == 4.0
-        
+
         # Test max delay limit
         delay_max = RetryHelper.calculate_backoff(10, base_delay=1.0, max_delay=5.0)
         assert delay_max == 5.0
+
+        # Jittered delays stay within (0, computed delay]
+        for _ in range(10):
+            assert 0 <= RetryHelper.calculate_backoff(2, base_delay=1.0, jitter=True) <= 4.0
     
     def test_should_retry(self):
         """Test retry decision logic."""